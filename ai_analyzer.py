@@ -1,170 +1,273 @@
 import os
-import json
+import copy
+import hashlib
 import boto3
-from typing import Dict, List, Optional
+import orjson
+from botocore.config import Config
+from typing import Dict, Iterator, List, Optional
 from dotenv import load_dotenv
 import re
+import textwrap
+import random
+import asyncio
+import threading
+import functools
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from response_cache import DiskResponseCache, ResponseCache
+from token_bucket import TokenBucket
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 load_dotenv()
 
-class AIAnalyzer:
-    """AWS Bedrock AI analyzer for YouTube content optimization"""
-    
-    def __init__(self):
-        self.aws_access_key = os.getenv('AWS_ACCESS_KEY_ID')
-        self.aws_secret_key = os.getenv('AWS_SECRET_ACCESS_KEY')
-        self.aws_region = os.getenv('AWS_REGION', 'us-east-1')
-        self.bedrock_client = None
-        
-        if self.aws_access_key and self.aws_secret_key:
-            try:
-                # By creating a new session, we avoid loading from the default config file
-                session = boto3.Session()
-                self.bedrock_client = session.client(
-                    'bedrock-runtime',
-                    aws_access_key_id=self.aws_access_key,
-                    aws_secret_access_key=self.aws_secret_key,
-                    region_name=self.aws_region
-                )
-            except Exception as e:
-                print(f"Error initializing AWS Bedrock client: {e}")
-    
-    def is_configured(self) -> bool:
-        """Check if AWS Bedrock is properly configured"""
-        return self.bedrock_client is not None
-    
-    def analyze_video(self, video: Dict) -> Dict:
-        """Analyze a video and provide AI-powered suggestions"""
-        if not self.is_configured():
-            return self._get_mock_suggestions(video)
-        
-        try:
-            # Prepare video data for analysis
-            video_context = {
-                'title': video.get('title', ''),
-                'description': video.get('description', '')[:1000],  # Limit description length
-                'tags': video.get('tags', []),
-                'views': video.get('viewCount', 0),
-                'likes': video.get('likeCount', 0),
-                'comments': video.get('commentCount', 0),
-                'duration': video.get('duration', ''),
-            }
-            
-            # Get AI suggestions
-            suggestions = {}
-            
-            # Analyze title
-            improved_title = self._generate_better_title(video_context)
-            if improved_title:
-                suggestions['improved_title'] = improved_title
-            
-            # Analyze description
-            improved_description = self._improve_description(video_context)
-            if improved_description:
-                suggestions['improved_description'] = improved_description
-            
-            # Suggest tags
-            suggested_tags = self._suggest_tags(video_context)
-            if suggested_tags:
-                suggestions['suggested_tags'] = suggested_tags
-            
-            # Generate content ideas
-            content_ideas = self._generate_content_ideas(video_context)
-            if content_ideas:
-                suggestions['content_ideas'] = content_ideas
-            
-            # SEO analysis
-            seo_analysis = self._analyze_seo(video_context)
-            if seo_analysis:
-                suggestions['seo_analysis'] = seo_analysis
-            
-            return suggestions
-            
-        except Exception as e:
-            print(f"Error in AI analysis: {e}")
-            return self._get_mock_suggestions(video)
+logger = logging.getLogger(__name__)
 
-    def get_deep_analysis(self, video: Dict) -> Dict:
-        """Generate deep analysis for a video."""
-        if not self.is_configured():
-            return self._get_mock_deep_analysis(video)
+# Read once at import so creating an analyzer never touches the environment
+AWS_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID')
+AWS_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY')
+AWS_REGION = os.getenv('AWS_REGION', 'us-east-1')
 
-        try:
-            video_context = {
-                'title': video.get('title', ''),
-                'description': video.get('description', '')[:1000],
-                'tags': video.get('tags', []),
-                'views': video.get('views', 0),
-                'engagement_rate': video.get('engagement_rate', 0)
-            }
+# Claude responses are also kept on disk so identical prompts are free across restarts
+RESPONSE_CACHE_PATH = os.getenv(
+    'RESPONSE_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'claude_responses.sqlite3')
+)
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', 7 * 24 * 60 * 60))
 
-            prompt = f"""
-            Provide a deep, comprehensive analysis of this YouTube video for performance improvement.
 
-            **Video Context:**
-            - **Title:** "{video_context['title']}"
-            - **Description:** "{video_context['description'][:500]}"
-            - **Tags:** {", ".join(video_context['tags'])}
-            - **Views:** {video_context['views']}
-            - **Engagement Rate:** {video_context.get('engagement_rate', 'N/A'):.2f}%
+# Set BEDROCK_MODEL_ID to a cross-region inference profile such as
+# "us.anthropic.claude-3-5-haiku-20241022-v1:0" to get latency-optimized inference
+MODEL_ID = os.getenv('BEDROCK_MODEL_ID', "anthropic.claude-3-5-sonnet-20240620-v1:0")
 
-            **Analysis Sections:**
+# Claude models that accept cache points on Bedrock
+PROMPT_CACHING_MODELS = (
+    'claude-3-5-haiku',
+    'claude-3-7-sonnet',
+    'claude-sonnet-4',
+    'claude-opus-4',
+)
 
-            1.  **Title Analysis**: 
-                - Critique the current title's effectiveness (clarity, SEO, click-through potential).
-                - Provide 3-5 alternative, optimized titles with explanations for why they are better.
+# Claude models that Bedrock can serve with latency-optimized inference
+LATENCY_OPTIMIZED_MODELS = (
+    'claude-3-5-haiku',
+)
 
-            2.  **Description Analysis**:
-                - Critique the current description's structure, SEO, and call-to-actions.
-                - Provide a completely rewritten, optimized description that is ready to be copied and pasted.
+# Latency-optimized inference is only offered through inference profiles
+_INFERENCE_PROFILE_RE = re.compile(r'^(us|eu|apac|us-gov|global)\.|:inference-profile/')
 
-            3.  **Tags Analysis**:
-                - Critique the current tags for relevance, mix of broad/specific keywords, and volume.
-                - Provide a list of 15-20 optimized tags.
+# Shared by every analyzer: a larger keep-alive pool so concurrent requests reuse
+# connections, and adaptive retries that back off when Bedrock throttles
+BEDROCK_CLIENT_CONFIG = Config(
+    max_pool_connections=32,
+    retries={'max_attempts': 5, 'mode': 'adaptive'},
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=60,
+)
 
-            4.  **Thumbnail Analysis**: 
-                - Critique the likely thumbnail concept based on the title.
-                - Suggest 3 specific, actionable improvements for the thumbnail design to increase CTR.
+_WORD_RE = re.compile(r'\b\w+\b')
 
-            5.  **Content & Pacing**: 
-                - Suggest an improved structure for this type of video (e.g., hook, intro, main points, CTA, outro).
-                - Provide feedback on potential pacing improvements.
+# Applied once to video fields before they are quoted in a prompt, so a stray
+# quote or line break cannot end the field early and read as an instruction
+_SAFE_TRANS = str.maketrans({'"': '\\"', '\n': ' ', '\r': ' ', '\x00': ''})
 
-            6.  **Audience Persona**: 
-                - Describe the likely target audience for this video and how to better tailor the content for them.
+# Approximate tokenizer used when tiktoken is not installed: words (about four
+# characters per token) and single punctuation or emoji characters
+_TOKEN_RE = re.compile(r'\w+|[^\w\s]')
 
-            7.  **Engagement Strategy**: 
-                - Suggest 3 specific hooks or questions to add to the video to increase likes, comments, and shares.
+# Common words ignored by keyword extraction
+_STOP_WORDS = frozenset({
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'a', 'an',
+    'is', 'are', 'was', 'were', 'how', 'what', 'when', 'where', 'why'
+})
 
-            8.  **Monetization Potential**: 
-                - Provide 2-3 creative ideas for monetizing this specific video's content or audience.
-            
-            9.  **Overall Score & Summary**:
-                - Provide an overall optimization score out of 100.
-                - Summarize the top 3 most critical changes needed to improve performance.
+# Mock suggestions kept per analyzer, keyed by the video fields they depend on
+MOCK_CACHE_SIZE = 256
 
-            Format the entire response in Markdown. Use headings for each section.
-            """
-            
-            response = self._call_claude(prompt)
-            
-            if response:
-                return {'deep_analysis': response}
-            else:
-                return self._get_mock_deep_analysis(video)
+# Varies mock output between calls while keeping runs reproducible
+_MOCK_RANDOM = random.Random(42)
 
-        except Exception as e:
-            print(f"Error in deep AI analysis: {e}")
-            return self._get_mock_deep_analysis(video)
+# Seconds to wait for all section requests when sections run concurrently
+SECTION_TIMEOUT = 120
+
+# On-demand audits pack this many videos into one Claude request. Each video's
+# suggestions are roughly 800 output tokens, so a group fits the 4,096 limit
+MULTI_VIDEO_PROMPT_SIZE = 4
+MULTI_VIDEO_MAX_TOKENS = 4096
+
+def supports_prompt_caching(model_id: str) -> bool:
+    """Check if a Bedrock model ID supports prompt caching"""
+    return any(model in model_id for model in PROMPT_CACHING_MODELS)
+
+def supports_latency_optimization(model_id: str) -> bool:
+    """Check if a Bedrock model ID supports latency-optimized inference"""
+    return (
+        any(model in model_id for model in LATENCY_OPTIMIZED_MODELS)
+        and _INFERENCE_PROFILE_RE.search(model_id) is not None
+    )
+
+@functools.lru_cache(maxsize=256)
+def _extract_keywords_cached(text: str) -> tuple:
+    """Extract up to 10 keywords from text, memoized since mock paths repeat titles"""
+    # Filter out common words, keeping unique keywords in order of appearance
+    keywords = [word for word in _WORD_RE.findall(text.lower()) if len(word) > 3 and word not in _STOP_WORDS]
+    return tuple(dict.fromkeys(keywords))[:10]  # Max 10 keywords
+
+# Marks the end of the static instructions as a prompt cache prefix
+_CACHE_POINT = {"cachePoint": {"type": "default"}}
+
+@functools.lru_cache(maxsize=1)
+def _get_bedrock_client():
+    """Create the Bedrock runtime client once and share it across analyzers"""
+    if not (AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY):
+        return None
     
-    def _generate_better_title(self, video_context: Dict) -> Optional[str]:
-        """Generate a better title using Claude"""
-        prompt = f"""
-        Analyze this YouTube video title and suggest an improved version that will get more clicks and views.
+    # By creating a new session, we avoid loading from the default config file
+    session = boto3.Session()
+    return session.client(
+        'bedrock-runtime',
+        aws_access_key_id=AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+        region_name=AWS_REGION,
+        config=BEDROCK_CLIENT_CONFIG
+    )
+
+@functools.lru_cache(maxsize=1)
+def _get_disk_cache() -> Optional[DiskResponseCache]:
+    """Open the on-disk response cache once, or run without it if that fails"""
+    try:
+        return DiskResponseCache(RESPONSE_CACHE_PATH, ttl=RESPONSE_CACHE_TTL)
+    except Exception as e:
+        logger.error("Error opening response cache at %s: %s", RESPONSE_CACHE_PATH, e)
+        return None
+
+# Shared by every analyzer, so Streamlit reruns that build a new AIAnalyzer
+# still hit responses cached by earlier runs
+_RESPONSE_CACHE = ResponseCache()
+
+# Client-side throttle shared by every analyzer: short local waits instead of
+# Bedrock throttling errors when sections and batch audits fan out
+CLAUDE_REQUESTS_PER_SECOND = 8
+CLAUDE_REQUEST_BURST = 16
+_CLAUDE_BUCKET = TokenBucket(rate=CLAUDE_REQUESTS_PER_SECOND, capacity=CLAUDE_REQUEST_BURST)
+
+def response_cached(call_claude):
+    """Serve Claude responses from the analyzer's response cache when possible"""
+    @functools.wraps(call_claude)
+    def wrapper(self, prompt: str, max_tokens: int = 1000, instructions: Optional[str] = None,
+                tool: Optional[Dict] = None) -> Optional[str]:
+        if not self.bedrock_client:
+            return None
+        
+        key = self._response_cache_key(prompt, max_tokens, instructions, tool)
+        
+        cached = self._get_cached_response(key)
+        if cached is not None:
+            return cached
+        
+        self._record_cache_lookup(hit=False)
+        response = call_claude(self, prompt, max_tokens, instructions, tool)
+        if response:
+            self._store_response(key, response)
+        return response
+    
+    return wrapper
+
+class MockSuggestions(dict):
+    """Suggestions made up locally because Claude was unavailable, so callers can tell them apart"""
+
+class AIAnalyzer:
+    """AWS Bedrock AI analyzer for YouTube content optimization"""
+    
+    # tiktoken encoder shared by every analyzer, loaded on first use
+    _encoder = None
+    
+    # Static instructions are sent ahead of the video details in every prompt,
+    # so Bedrock can cache them as a prefix shared by all videos
+    SUGGESTIONS_INSTRUCTIONS = textwrap.dedent("""
+        Analyze the YouTube video below and suggest improvements that will get more clicks, views and engagement.
         
-        Current title: "{video_context['title']}"
-        Video performance: {video_context['views']} views, {video_context['likes']} likes
-        Duration: {video_context['duration']}
+        Provide:
+        1. improved_title: a 40-60 character title that uses emotional triggers and power words, is SEO-friendly and creates curiosity or urgency
+        2. improved_description: a 200-300 word description that starts with a compelling hook, includes relevant keywords naturally, has proper structure with line breaks, includes a call-to-action and uses timestamps if appropriate
+        3. suggested_tags: 10-15 optimized tags that mix broad and specific keywords with good search volume
+        4. content_ideas: 5 related, actionable content ideas for future videos that would appeal to the same audience
+        5. seo_analysis: title, description and tags scores (1-10), the main keywords identified and missing keywords that should be added
+        
+        Return your suggestions by calling the emit_suggestions tool.
+        """).strip()
+    
+    MULTI_SUGGESTIONS_INSTRUCTIONS = textwrap.dedent("""
+        Analyze each of the numbered YouTube videos below and suggest improvements that will get more clicks, views and engagement.
+        
+        Provide, for every video:
+        1. improved_title: a 40-60 character title that uses emotional triggers and power words, is SEO-friendly and creates curiosity or urgency
+        2. improved_description: a 200-300 word description that starts with a compelling hook, includes relevant keywords naturally, has proper structure with line breaks, includes a call-to-action and uses timestamps if appropriate
+        3. suggested_tags: 10-15 optimized tags that mix broad and specific keywords with good search volume
+        4. content_ideas: 5 related, actionable content ideas for future videos that would appeal to the same audience
+        5. seo_analysis: title, description and tags scores (1-10), the main keywords identified and missing keywords that should be added
+        
+        Return the suggestions for all videos in one call to the emit_video_suggestions tool, with one entry per video and its number as video_index.
+        """).strip()
+    
+    # Claude is forced to call this tool, so the combined suggestions always
+    # come back as JSON matching the schema
+    SUGGESTIONS_TOOL = {
+        'name': 'emit_suggestions',
+        'description': 'Return every suggestion for the YouTube video',
+        'schema': {
+            'type': 'object',
+            'properties': {
+                'improved_title': {'type': 'string'},
+                'improved_description': {'type': 'string'},
+                'suggested_tags': {'type': 'array', 'items': {'type': 'string'}},
+                'content_ideas': {'type': 'array', 'items': {'type': 'string'}},
+                'seo_analysis': {
+                    'type': 'object',
+                    'properties': {
+                        'title_score': {'type': 'integer'},
+                        'description_score': {'type': 'integer'},
+                        'tags_score': {'type': 'integer'},
+                        'main_keywords': {'type': 'array', 'items': {'type': 'string'}},
+                        'missing_keywords': {'type': 'array', 'items': {'type': 'string'}},
+                    },
+                    'required': ['title_score', 'description_score', 'tags_score', 'main_keywords', 'missing_keywords'],
+                },
+            },
+            'required': ['improved_title', 'improved_description', 'suggested_tags', 'content_ideas', 'seo_analysis'],
+        },
+    }
+    
+    # Same suggestions for several videos at once, tagged with each video's number
+    MULTI_SUGGESTIONS_TOOL = {
+        'name': 'emit_video_suggestions',
+        'description': 'Return every suggestion for each of the numbered YouTube videos',
+        'schema': {
+            'type': 'object',
+            'properties': {
+                'videos': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'video_index': {'type': 'integer'},
+                            **SUGGESTIONS_TOOL['schema']['properties'],
+                        },
+                        'required': ['video_index', *SUGGESTIONS_TOOL['schema']['required']],
+                    },
+                },
+            },
+            'required': ['videos'],
+        },
+    }
+    
+    TITLE_INSTRUCTIONS = textwrap.dedent("""
+        Analyze the YouTube video title below and suggest an improved version that will get more clicks and views.
         
         Please suggest a better title that:
         1. Is 40-60 characters long
@@ -174,19 +277,10 @@ class AIAnalyzer:
         5. Creates curiosity or urgency
         
         Respond with just the improved title, no explanation.
-        """
-        
-        return self._call_claude(prompt)
+        """).strip()
     
-    def _improve_description(self, video_context: Dict) -> Optional[str]:
-        """Improve video description using Claude"""
-        current_desc = video_context['description'][:500]  # First 500 chars
-        
-        prompt = f"""
-        Improve this YouTube video description for better SEO and engagement:
-        
-        Current title: "{video_context['title']}"
-        Current description: "{current_desc}"
+    DESCRIPTION_INSTRUCTIONS = textwrap.dedent("""
+        Improve the YouTube video description below for better SEO and engagement.
         
         Create an improved description that:
         1. Starts with a compelling hook
@@ -197,20 +291,10 @@ class AIAnalyzer:
         6. Uses timestamps if appropriate
         
         Respond with just the improved description.
-        """
-        
-        return self._call_claude(prompt)
+        """).strip()
     
-    def _suggest_tags(self, video_context: Dict) -> Optional[List[str]]:
-        """Suggest better tags using Claude"""
-        current_tags = ", ".join(video_context['tags'][:10])  # First 10 tags
-        
-        prompt = f"""
-        Suggest better YouTube tags for this video:
-        
-        Title: "{video_context['title']}"
-        Current tags: {current_tags}
-        Description snippet: "{video_context['description'][:200]}"
+    TAGS_INSTRUCTIONS = textwrap.dedent("""
+        Suggest better YouTube tags for the video below.
         
         Suggest 10-15 optimized tags that:
         1. Include the main topic
@@ -219,24 +303,11 @@ class AIAnalyzer:
         4. Include trending terms
         5. Are relevant to the content
         
-        Respond with tags separated by commas, no explanation.
-        """
-        
-        response = self._call_claude(prompt)
-        if response:
-            # Parse tags from response
-            tags = [tag.strip() for tag in response.split(',')]
-            return [tag for tag in tags if tag and len(tag) <= 30]  # Filter valid tags
-        return None
+        Respond as JSON: {"tags": [...]}, no explanation.
+        """).strip()
     
-    def _generate_content_ideas(self, video_context: Dict) -> Optional[List[str]]:
-        """Generate content ideas using Claude"""
-        prompt = f"""
-        Based on this YouTube video, suggest 5 related content ideas for future videos:
-        
-        Video title: "{video_context['title']}"
-        Description: "{video_context['description'][:300]}"
-        Performance: {video_context['views']} views, {video_context['likes']} likes
+    CONTENT_IDEAS_INSTRUCTIONS = textwrap.dedent("""
+        Based on the YouTube video below, suggest 5 related content ideas for future videos.
         
         Suggest content ideas that:
         1. Are related to the original topic
@@ -245,32 +316,11 @@ class AIAnalyzer:
         4. Are actionable and specific
         5. Build on successful elements
         
-        Format as a numbered list, one idea per line.
-        """
-        
-        response = self._call_claude(prompt)
-        if response:
-            # Parse ideas from response
-            ideas = []
-            for line in response.split('\n'):
-                line = line.strip()
-                if line and (line[0].isdigit() or line.startswith('-')):
-                    # Remove numbering
-                    idea = re.sub(r'^\d+\.?\s*', '', line)
-                    idea = re.sub(r'^-\s*', '', idea)
-                    if idea:
-                        ideas.append(idea)
-            return ideas[:5]
-        return None
+        Respond as JSON: {"ideas": [...]}, no explanation.
+        """).strip()
     
-    def _analyze_seo(self, video_context: Dict) -> Optional[Dict]:
-        """Analyze SEO aspects of the video"""
-        prompt = f"""
-        Analyze the SEO aspects of this YouTube video:
-        
-        Title: "{video_context['title']}"
-        Description: "{video_context['description'][:500]}"
-        Tags: {", ".join(video_context['tags'][:10])}
+    SEO_INSTRUCTIONS = textwrap.dedent("""
+        Analyze the SEO aspects of the YouTube video below.
         
         Provide analysis on:
         1. Title SEO score (1-10)
@@ -280,14 +330,600 @@ class AIAnalyzer:
         5. Missing keywords that should be added
         
         Format as JSON with keys: title_score, description_score, tags_score, main_keywords, missing_keywords
+        """).strip()
+    
+    # Per-video prompt templates, dedented once here so the indentation is
+    # never sent (or billed) as input tokens
+    _SUGGESTIONS_PROMPT_TMPL = textwrap.dedent("""
+        Title: "{title}"
+        Description: "{description}"
+        Tags: {tags}
+        Performance: {views} views, {likes} likes, {comments} comments
+        Duration: {duration}
+        """).strip()
+    
+    _TITLE_PROMPT_TMPL = textwrap.dedent("""
+        Current title: "{title}"
+        Video performance: {views} views, {likes} likes
+        Duration: {duration}
+        """).strip()
+    
+    _DESCRIPTION_PROMPT_TMPL = textwrap.dedent("""
+        Current title: "{title}"
+        Current description: "{description}"
+        """).strip()
+    
+    _TAGS_PROMPT_TMPL = textwrap.dedent("""
+        Title: "{title}"
+        Current tags: {tags}
+        Description snippet: "{description}"
+        """).strip()
+    
+    _CONTENT_IDEAS_PROMPT_TMPL = textwrap.dedent("""
+        Video title: "{title}"
+        Description: "{description}"
+        Performance: {views} views, {likes} likes
+        """).strip()
+    
+    _SEO_PROMPT_TMPL = textwrap.dedent("""
+        Title: "{title}"
+        Description: "{description}"
+        Tags: {tags}
+        """).strip()
+    
+    _DEEP_ANALYSIS_PROMPT_TMPL = textwrap.dedent("""
+        **Video Context:**
+        - **Title:** "{title}"
+        - **Description:** "{description}"
+        - **Tags:** {tags}
+        - **Views:** {views}
+        - **Engagement Rate:** {engagement_rate:.2f}%
+        """).strip()
+    
+    # Deep analysis sections: (name, video fields the section depends on, instructions).
+    # Each section is cached on its own, keyed only by the fields it depends on
+    DEEP_ANALYSIS_SECTIONS = (
+        ('Title Analysis', ('title', 'description', 'tags'), (
+            "Critique the current title's effectiveness (clarity, SEO, click-through potential).",
+            "Provide 3-5 alternative, optimized titles with explanations for why they are better.",
+        )),
+        ('Description Analysis', ('title', 'description', 'tags'), (
+            "Critique the current description's structure, SEO, and call-to-actions.",
+            "Provide a completely rewritten, optimized description that is ready to be copied and pasted.",
+        )),
+        ('Tags Analysis', ('title', 'description', 'tags'), (
+            "Critique the current tags for relevance, mix of broad/specific keywords, and volume.",
+            "Provide a list of 15-20 optimized tags.",
+        )),
+        ('Thumbnail Analysis', ('title', 'description', 'tags'), (
+            "Critique the likely thumbnail concept based on the title.",
+            "Suggest 3 specific, actionable improvements for the thumbnail design to increase CTR.",
+        )),
+        ('Content & Pacing', ('title', 'description', 'tags'), (
+            "Suggest an improved structure for this type of video (e.g., hook, intro, main points, CTA, outro).",
+            "Provide feedback on potential pacing improvements.",
+        )),
+        ('Audience Persona', ('title', 'description', 'tags'), (
+            "Describe the likely target audience for this video and how to better tailor the content for them.",
+        )),
+        ('Engagement Strategy', ('title', 'description', 'tags', 'views', 'engagement_rate'), (
+            "Suggest 3 specific hooks or questions to add to the video to increase likes, comments, and shares.",
+        )),
+        ('Monetization Potential', ('title', 'description', 'tags'), (
+            "Provide 2-3 creative ideas for monetizing this specific video's content or audience.",
+        )),
+        ('Overall Score & Summary', ('title', 'description', 'tags', 'views', 'engagement_rate'), (
+            "Provide an overall optimization score out of 100.",
+            "Summarize the top 3 most critical changes needed to improve performance.",
+        )),
+    )
+    
+    # Matches the heading of any deep analysis section, compiled once for all requests
+    _DEEP_SECTION_HEADING_RE = re.compile(
+        r'^#{1,3}\s*(?:\d+\.\s*)?\**(' + '|'.join(re.escape(name) for name, _, _ in DEEP_ANALYSIS_SECTIONS) + r')\**\s*:?\s*$',
+        re.MULTILINE | re.IGNORECASE
+    )
+    
+    # Building blocks for mock suggestions when AI is not available
+    POWER_WORDS = ('Ultimate', 'Secret', 'Proven', 'Amazing', 'Incredible', 'Essential')
+    NUMBERS = ('5', '7', '10', '15', '20')
+    TRENDING_TAGS = ('viral', 'trending', 'popular', 'new', 'latest', 'best', 'top', 'guide', 'tutorial', 'tips')
+    MOCK_HOOK = "🔥 Get ready to transform your understanding!"
+    MOCK_CTA = """
+        
+🔔 Don't forget to SUBSCRIBE for more amazing content!
+👍 LIKE this video if it helped you!
+💬 COMMENT below with your thoughts!
+        
+#trending #viral #tutorial
         """
+    
+    def __init__(self, model_id: Optional[str] = None):
+        self.model_id = model_id or MODEL_ID
+        self.bedrock_client = None
+        self.prompt_caching = supports_prompt_caching(self.model_id)
+        self.latency_optimized = supports_latency_optimization(self.model_id)
+        # Converse arguments that are the same for every request
+        self._request_template = {"modelId": self.model_id}
+        if self.latency_optimized:
+            self._request_template["performanceConfig"] = {"latency": "optimized"}
+        self._tool_configs = {}
+        self.usage = {
+            'inputTokens': 0,
+            'outputTokens': 0,
+            'cacheReadInputTokens': 0,
+            'cacheWriteInputTokens': 0,
+        }
+        self._usage_lock = threading.Lock()
+        self._cache = _RESPONSE_CACHE
+        self._disk_cache = _get_disk_cache()
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        self._mock_suggestions = OrderedDict()
+        self._mock_lock = threading.Lock()
+        self._bucket = _CLAUDE_BUCKET
         
-        response = self._call_claude(prompt)
+        try:
+            self.bedrock_client = _get_bedrock_client()
+        except Exception as e:
+            logger.error("Error initializing AWS Bedrock client: %s", e)
+    
+    def is_configured(self) -> bool:
+        """Check if AWS Bedrock is properly configured"""
+        return self.bedrock_client is not None
+    
+    def analyze_video(self, video: Dict) -> Dict:
+        """Analyze a video and provide AI-powered suggestions"""
+        if not self.is_configured():
+            return self._get_mock_suggestions(video)
+        
+        try:
+            video_context = self._build_video_context(video)
+            
+            # Get all suggestions from a single Claude request
+            suggestions = self._generate_all_suggestions(video_context)
+            if suggestions is None:
+                suggestions = self._generate_suggestions_by_section(video_context)
+            
+            return suggestions
+            
+        except Exception as e:
+            logger.error("Error in AI analysis: %s", e)
+            return self._get_mock_suggestions(video)
+
+    def analyze_video_group(self, videos: List[Dict]) -> List[Dict]:
+        """Analyze a few videos with one Claude request, falling back to one request per video"""
+        if not self.is_configured():
+            return [self._get_mock_suggestions(video) for video in videos]
+        
+        try:
+            results = self._generate_group_suggestions([self._build_video_context(video) for video in videos])
+        except Exception as e:
+            logger.error("Error in grouped AI analysis: %s", e)
+            results = [None] * len(videos)
+        
+        # Videos missing from the combined response are analyzed on their own
+        return [
+            suggestions if suggestions is not None else self.analyze_video(video)
+            for video, suggestions in zip(videos, results)
+        ]
+    
+    async def aanalyze_video(self, video: Dict) -> Dict:
+        """Async variant of analyze_video that does not block the event loop"""
+        if not self.is_configured():
+            return self._get_mock_suggestions(video)
+        
+        try:
+            video_context = self._build_video_context(video)
+            
+            suggestions = await asyncio.to_thread(self._generate_all_suggestions, video_context)
+            if suggestions is not None:
+                return suggestions
+            
+            # Fall back to one request per section, all in flight at once
+            sections = self._section_generators()
+            results = await asyncio.gather(
+                *(asyncio.to_thread(generate, video_context) for generate in sections.values()),
+                return_exceptions=True
+            )
+            
+            suggestions = {}
+            for key, result in zip(sections, results):
+                if isinstance(result, Exception):
+                    logger.error("Error generating %s: %s", key, result)
+                elif result:
+                    suggestions[key] = result
+            return suggestions
+            
+        except Exception as e:
+            logger.error("Error in AI analysis: %s", e)
+            return self._get_mock_suggestions(video)
+    
+    async def aanalyze_video_group(self, videos: List[Dict]) -> List[Dict]:
+        """Async variant of analyze_video_group that does not block the event loop"""
+        return await asyncio.to_thread(self.analyze_video_group, videos)
+    
+    async def aget_deep_analysis(self, video: Dict) -> Dict:
+        """Async variant of get_deep_analysis that does not block the event loop"""
+        return await asyncio.to_thread(self.get_deep_analysis, video)
+
+    def get_deep_analysis(self, video: Dict) -> Dict:
+        """Generate deep analysis for a video."""
+        if not self.is_configured():
+            return self._get_mock_deep_analysis(video)
+
+        try:
+            video_context, prompt = self._deep_analysis_prompt(video)
+            
+            # Reuse cached sections and only ask Claude for the rest
+            section_keys, section_texts, missing = self._cached_deep_sections(video_context)
+            
+            if missing:
+                response = self._call_claude(
+                    prompt,
+                    max_tokens=2000,
+                    instructions=self._deep_analysis_instructions(missing)
+                )
+                if not response:
+                    return self._get_mock_deep_analysis(video)
+                
+                fresh = self._split_deep_analysis(response, missing)
+                if not fresh:
+                    # Claude ignored the section headings, so show the response as-is
+                    cached = self._join_deep_analysis(section_texts)
+                    return {'deep_analysis': f"{cached}\n\n{response}" if cached else response}
+                
+                for name, text in fresh.items():
+                    self._cache.set(section_keys[name], text)
+                    section_texts[name] = text
+            
+            return {'deep_analysis': self._join_deep_analysis(section_texts)}
+
+        except Exception as e:
+            logger.error("Error in deep AI analysis: %s", e)
+            return self._get_mock_deep_analysis(video)
+    
+    def get_deep_analysis_stream(self, video: Dict) -> Iterator[str]:
+        """Generate deep analysis for a video, yielding markdown as Claude writes it"""
+        if not self.is_configured():
+            yield self._get_mock_deep_analysis(video)['deep_analysis']
+            return
+        
+        streamed = []
+        try:
+            video_context, prompt = self._deep_analysis_prompt(video)
+            section_keys, section_texts, missing = self._cached_deep_sections(video_context)
+            
+            cached = self._join_deep_analysis(section_texts)
+            if cached:
+                streamed.append(cached)
+                yield cached
+            if not missing:
+                return
+            
+            if cached:
+                yield "\n\n"
+            response_chunks = []
+            for chunk in self._call_claude_stream(
+                prompt,
+                max_tokens=2000,
+                instructions=self._deep_analysis_instructions(missing)
+            ):
+                response_chunks.append(chunk)
+                streamed.append(chunk)
+                yield chunk
+            
+            # Cache the streamed sections so later requests can reuse them
+            fresh = self._split_deep_analysis("".join(response_chunks), missing)
+            for name, text in fresh.items():
+                self._cache.set(section_keys[name], text)
+            
+        except Exception as e:
+            logger.error("Error in deep AI analysis: %s", e)
+        
+        if not streamed:
+            yield self._get_mock_deep_analysis(video)['deep_analysis']
+    
+    def _deep_analysis_prompt(self, video: Dict):
+        """Build the video context and per-video prompt for deep analysis"""
+        video_context = {
+            'title': video.get('title', ''),
+            'description': self._truncate_tokens(video.get('description', ''), 250),
+            'tags': video.get('tags', []),
+            'views': video.get('views', 0),
+            'engagement_rate': video.get('engagement_rate', 0)
+        }
+
+        prompt = self._DEEP_ANALYSIS_PROMPT_TMPL.format(
+            title=(video_context['title'] or '').translate(_SAFE_TRANS),
+            description=self._truncate_tokens(video_context['description'], 125).translate(_SAFE_TRANS),
+            tags=", ".join(video_context['tags']).translate(_SAFE_TRANS),
+            views=video_context['views'],
+            engagement_rate=video_context['engagement_rate']
+        )
+        return video_context, prompt
+    
+    def _cached_deep_sections(self, video_context: Dict):
+        """Look up cached deep analysis sections and list the ones still missing"""
+        section_keys = {
+            name: self._deep_section_key(name, fields, video_context)
+            for name, fields, _ in self.DEEP_ANALYSIS_SECTIONS
+        }
+        section_texts = {name: self._cache.get(key) for name, key in section_keys.items()}
+        missing = [section for section in self.DEEP_ANALYSIS_SECTIONS if section_texts[section[0]] is None]
+        return section_keys, section_texts, missing
+    
+    def _deep_analysis_instructions(self, sections) -> str:
+        """Build deep analysis instructions covering only the given sections"""
+        lines = [
+            "Provide a deep, comprehensive analysis of the YouTube video described after these instructions for performance improvement.",
+            "",
+            "**Analysis Sections:**",
+            "",
+        ]
+        for number, (name, _, points) in enumerate(sections, 1):
+            lines.append(f"{number}.  **{name}**:")
+            lines.extend(f"    - {point}" for point in points)
+            lines.append("")
+        lines.append(
+            "Format the entire response in Markdown. Start each section with a level-2 heading "
+            "containing only the section name (for example \"## Title Analysis\") and use no other level-2 headings."
+        )
+        return "\n".join(lines)
+    
+    def _deep_section_key(self, name: str, fields, video_context: Dict) -> str:
+        """Cache key for one deep analysis section"""
+        values = []
+        for field in fields:
+            value = video_context[field]
+            values.append(", ".join(value) if isinstance(value, list) else str(value))
+        return ResponseCache.make_key('deep_analysis', name, *values)
+    
+    def _split_deep_analysis(self, response: str, sections) -> Dict[str, str]:
+        """Split a deep analysis response into its sections by heading"""
+        names = {name.lower(): name for name, _, _ in sections}
+        
+        matches = list(self._DEEP_SECTION_HEADING_RE.finditer(response))
+        section_texts = {}
+        for i, match in enumerate(matches):
+            name = names.get(match.group(1).lower())
+            if name is None:
+                # A heading for a section we did not ask for still ends the previous one
+                continue
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(response)
+            text = response[match.end():end].strip()
+            if text:
+                section_texts[name] = text
+        return section_texts
+    
+    def _join_deep_analysis(self, section_texts: Dict[str, Optional[str]]) -> str:
+        """Assemble deep analysis sections in their template order"""
+        return "\n\n".join(
+            f"## {name}\n\n{section_texts[name]}"
+            for name, _, _ in self.DEEP_ANALYSIS_SECTIONS
+            if section_texts.get(name)
+        )
+    
+    def _build_video_context(self, video: Dict) -> Dict:
+        """Prepare video data for analysis"""
+        description = self._truncate_tokens(video.get('description', ''), 250)  # Limit description to ~1000 chars
+        tags = video.get('tags', [])
+        return {
+            'title': video.get('title', ''),
+            'description': description,
+            'tags': tags,
+            'views': video.get('viewCount', 0),
+            'likes': video.get('likeCount', 0),
+            'comments': video.get('commentCount', 0),
+            'duration': video.get('duration', ''),
+            # Prompt-safe snippets shared by every section, built once per video
+            'title_safe': (video.get('title') or '').translate(_SAFE_TRANS),
+            'desc_500': self._truncate_tokens(description, 125).translate(_SAFE_TRANS),
+            'desc_300': self._truncate_tokens(description, 75).translate(_SAFE_TRANS),
+            'desc_200': self._truncate_tokens(description, 50).translate(_SAFE_TRANS),
+            'tags_joined': ", ".join(tags[:10]).translate(_SAFE_TRANS),
+        }
+    
+    def _generate_all_suggestions(self, video_context: Dict) -> Optional[Dict]:
+        """Generate every suggestion for a video with one Claude request"""
+        response = self._call_claude(
+            self._suggestions_prompt(video_context),
+            max_tokens=2500,
+            instructions=self.SUGGESTIONS_INSTRUCTIONS,
+            tool=self.SUGGESTIONS_TOOL
+        )
+        return self._parse_suggestions(response)
+    
+    def _generate_group_suggestions(self, video_contexts: List[Dict]) -> List[Optional[Dict]]:
+        """Generate suggestions for several videos with one Claude request"""
+        results = [None] * len(video_contexts)
+        
+        # Videos already analyzed, alone or in another group, come from the cache
+        prompts = [self._suggestions_prompt(video_context) for video_context in video_contexts]
+        keys = [
+            self._response_cache_key(prompt, 2500, self.SUGGESTIONS_INSTRUCTIONS, self.SUGGESTIONS_TOOL)
+            for prompt in prompts
+        ]
+        pending = []
+        for index, key in enumerate(keys):
+            results[index] = self._parse_suggestions(self._get_cached_response(key))
+            if results[index] is None:
+                pending.append(index)
+        
+        # A lone video gains nothing from the combined prompt
+        if len(pending) < 2:
+            return results
+        
+        prompt = "\n\n".join(
+            f"Video {number}:\n{prompts[index]}" for number, index in enumerate(pending, 1)
+        )
+        response = self._call_claude(
+            prompt,
+            max_tokens=MULTI_VIDEO_MAX_TOKENS,
+            instructions=self.MULTI_SUGGESTIONS_INSTRUCTIONS,
+            tool=self.MULTI_SUGGESTIONS_TOOL
+        )
+        parsed = self._parse_json_object(response) if response else None
+        entries = parsed.get('videos') if parsed else None
+        if not isinstance(entries, list):
+            return results
+        
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            number = entry.pop('video_index', None)
+            if not isinstance(number, int) or not 1 <= number <= len(pending):
+                continue
+            suggestions = self._normalize_suggestions(entry)
+            if suggestions:
+                index = pending[number - 1]
+                results[index] = suggestions
+                # Cache it as if the video had been analyzed on its own
+                self._store_response(keys[index], orjson.dumps(entry).decode('utf-8'))
+        return results
+    
+    def _suggestions_prompt(self, video_context: Dict) -> str:
+        """Build the per-video prompt for the combined suggestions request"""
+        return self._SUGGESTIONS_PROMPT_TMPL.format(
+            title=video_context['title_safe'],
+            description=video_context['desc_500'],
+            tags=video_context['tags_joined'],
+            views=video_context['views'],
+            likes=video_context['likes'],
+            comments=video_context['comments'],
+            duration=video_context['duration']
+        )
+    
+    def _parse_suggestions(self, response: Optional[str]) -> Optional[Dict]:
+        """Normalize Claude's combined suggestions JSON"""
+        if not response:
+            return None
+        
+        result = self._parse_json_object(response)
+        if result is None:
+            return None
+        return self._normalize_suggestions(result)
+    
+    def _normalize_suggestions(self, result: Dict) -> Dict:
+        """Keep the well-formed fields of one video's suggestions"""
+        suggestions = {}
+        if result.get('improved_title'):
+            suggestions['improved_title'] = str(result['improved_title']).strip()
+        if result.get('improved_description'):
+            suggestions['improved_description'] = str(result['improved_description']).strip()
+        if isinstance(result.get('suggested_tags'), list):
+            tags = [str(tag).strip() for tag in result['suggested_tags']]
+            suggestions['suggested_tags'] = list(dict.fromkeys(tag for tag in tags if tag and len(tag) <= 30))
+        if isinstance(result.get('content_ideas'), list):
+            suggestions['content_ideas'] = [str(idea).strip() for idea in result['content_ideas'] if idea][:5]
+        if isinstance(result.get('seo_analysis'), dict):
+            suggestions['seo_analysis'] = result['seo_analysis']
+        
+        return suggestions
+    
+    def _section_generators(self) -> Dict:
+        """Map each suggestion key to the helper that generates it on its own"""
+        return {
+            'improved_title': self._generate_better_title,
+            'improved_description': self._improve_description,
+            'suggested_tags': self._suggest_tags,
+            'content_ideas': self._generate_content_ideas,
+            'seo_analysis': self._analyze_seo,
+        }
+    
+    def _generate_suggestions_by_section(self, video_context: Dict) -> Dict:
+        """Generate suggestions with one concurrent Claude request per section"""
+        sections = self._section_generators()
+        
+        results = {}
+        # The Bedrock client is thread-safe, so all sections share it
+        executor = ThreadPoolExecutor(max_workers=len(sections))
+        futures = {
+            executor.submit(generate, video_context): key
+            for key, generate in sections.items()
+        }
+        try:
+            # Collect sections as they finish, under one deadline for all of them
+            for future in as_completed(futures, timeout=SECTION_TIMEOUT):
+                key = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error("Error generating %s: %s", key, e)
+                    continue
+                if result:
+                    results[key] = result
+        except FuturesTimeoutError:
+            pending = [key for future, key in futures.items() if not future.done()]
+            logger.error("Timed out generating %s", ", ".join(pending))
+        finally:
+            # Return what finished instead of blocking on slow sections
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return {key: results[key] for key in sections if key in results}
+    
+    def _generate_better_title(self, video_context: Dict) -> Optional[str]:
+        """Generate a better title using Claude"""
+        prompt = self._TITLE_PROMPT_TMPL.format(
+            title=video_context['title_safe'],
+            views=video_context['views'],
+            likes=video_context['likes'],
+            duration=video_context['duration']
+        )
+        
+        return self._call_claude(prompt, instructions=self.TITLE_INSTRUCTIONS)
+    
+    def _improve_description(self, video_context: Dict) -> Optional[str]:
+        """Improve video description using Claude"""
+        prompt = self._DESCRIPTION_PROMPT_TMPL.format(title=video_context['title_safe'], description=video_context['desc_500'])
+        
+        return self._call_claude(prompt, instructions=self.DESCRIPTION_INSTRUCTIONS)
+    
+    def _suggest_tags(self, video_context: Dict) -> Optional[List[str]]:
+        """Suggest better tags using Claude"""
+        prompt = self._TAGS_PROMPT_TMPL.format(
+            title=video_context['title_safe'],
+            tags=video_context['tags_joined'],
+            description=video_context['desc_200']
+        )
+        
+        response = self._call_claude(prompt, instructions=self.TAGS_INSTRUCTIONS)
         if response:
-            try:
-                # Try to parse JSON response
-                return json.loads(response)
-            except:
+            tags = self._parse_json_list(response, 'tags')
+            if tags is None:
+                return None
+            tags = [str(tag).strip() for tag in tags]
+            return list(dict.fromkeys(tag for tag in tags if tag and len(tag) <= 30))  # Filter valid tags
+        return None
+    
+    def _generate_content_ideas(self, video_context: Dict) -> Optional[List[str]]:
+        """Generate content ideas using Claude"""
+        prompt = self._CONTENT_IDEAS_PROMPT_TMPL.format(
+            title=video_context['title_safe'],
+            description=video_context['desc_300'],
+            views=video_context['views'],
+            likes=video_context['likes']
+        )
+        
+        response = self._call_claude(prompt, instructions=self.CONTENT_IDEAS_INSTRUCTIONS)
+        if response:
+            ideas = self._parse_json_list(response, 'ideas')
+            if ideas is None:
+                return None
+            return [str(idea).strip() for idea in ideas if idea][:5]
+        return None
+    
+    def _analyze_seo(self, video_context: Dict) -> Optional[Dict]:
+        """Analyze SEO aspects of the video"""
+        prompt = self._SEO_PROMPT_TMPL.format(
+            title=video_context['title_safe'],
+            description=video_context['desc_500'],
+            tags=video_context['tags_joined']
+        )
+        
+        response = self._call_claude(prompt, instructions=self.SEO_INSTRUCTIONS)
+        if response:
+            seo_analysis = self._parse_json_object(response)
+            if seo_analysis is None:
                 # If JSON parsing fails, return basic analysis
                 return {
                     'title_score': 7,
@@ -296,49 +932,187 @@ class AIAnalyzer:
                     'main_keywords': self._extract_keywords(video_context['title']),
                     'missing_keywords': ['trending', 'popular', 'viral']
                 }
+            return seo_analysis
         return None
     
-    def _call_claude(self, prompt: str) -> Optional[str]:
-        """Call Claude Sonnet 3.5 via AWS Bedrock"""
+    @response_cached
+    def _call_claude(self, prompt: str, max_tokens: int = 1000, instructions: Optional[str] = None,
+                     tool: Optional[Dict] = None) -> Optional[str]:
+        """Call Claude via the AWS Bedrock Converse API, returning a forced tool call's input as JSON"""
         if not self.bedrock_client:
             return None
         
         try:
-            # Prepare the request body
-            body = {
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 1000,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            }
-            
-            # Call Bedrock - using the correct model ID
-            response = self.bedrock_client.invoke_model(
-                modelId="anthropic.claude-3-5-sonnet-20240620-v1:0",
-                contentType="application/json",
-                accept="application/json",
-                body=json.dumps(body)
-            )
+            # Cache hits return before this point, so only real requests are throttled
+            self._bucket.acquire()
+            response = self.bedrock_client.converse(**self._converse_request(prompt, max_tokens, instructions, tool))
             
-            # Parse response
-            response_body = json.loads(response['body'].read())
-            return response_body['content'][0]['text'].strip()
+            self._record_usage(response.get('usage', {}))
+            content = response['output']['message']['content']
+            if tool:
+                for block in content:
+                    if 'toolUse' in block:
+                        return orjson.dumps(block['toolUse']['input']).decode('utf-8')
+            return content[0]['text'].strip()
             
         except Exception as e:
-            print(f"Error calling Claude: {e}")
+            logger.error("Error calling Claude: %s", e)
+            return None
+    
+    def _call_claude_stream(self, prompt: str, max_tokens: int = 1000, instructions: Optional[str] = None) -> Iterator[str]:
+        """Call Claude via the Converse streaming API, yielding text as it arrives"""
+        if not self.bedrock_client:
+            return
+        
+        # Streamed and blocking calls share the exact-match cache, so a response
+        # either one produced is replayed instantly by the other
+        key = self._response_cache_key(prompt, max_tokens, instructions)
+        cached = self._get_cached_response(key)
+        if cached is not None:
+            yield cached
+            return
+        self._record_cache_lookup(hit=False)
+        
+        self._bucket.acquire()
+        response = self.bedrock_client.converse_stream(**self._converse_request(prompt, max_tokens, instructions))
+        chunks = []
+        for event in response['stream']:
+            if 'contentBlockDelta' in event:
+                text = event['contentBlockDelta']['delta'].get('text')
+                if text:
+                    chunks.append(text)
+                    yield text
+            elif 'metadata' in event:
+                self._record_usage(event['metadata'].get('usage', {}))
+        
+        full_response = "".join(chunks).strip()
+        if full_response:
+            self._store_response(key, full_response)
+    
+    def _response_cache_key(self, prompt: str, max_tokens: int, instructions: Optional[str],
+                            tool: Optional[Dict] = None) -> str:
+        """Build the exact-match cache key for a Claude request"""
+        # Prompts only match others built for the same model, instructions and tool
+        namespace = ResponseCache.make_key(
+            self.model_id, instructions or '', str(max_tokens), tool['name'] if tool else ''
+        )
+        return ResponseCache.make_key(namespace, prompt)
+    
+    def _get_cached_response(self, key: str) -> Optional[str]:
+        """Look up an exact-match response in memory, then on disk"""
+        cached = self._cache.get(key)
+        if cached is None and self._disk_cache is not None:
+            cached = self._disk_cache.get(key)
+            if cached is not None:
+                self._cache.set(key, cached)
+        if cached is not None:
+            self._record_cache_lookup(hit=True)
+        return cached
+    
+    def _store_response(self, key: str, response: str):
+        """Save a Claude response in memory and on disk"""
+        self._cache.set(key, response)
+        if self._disk_cache is not None:
+            self._disk_cache.set(key, response)
+    
+    def _converse_request(self, prompt: str, max_tokens: int, instructions: Optional[str],
+                          tool: Optional[Dict] = None) -> Dict:
+        """Build the Converse API arguments shared by normal and streaming calls"""
+        # Static instructions go first so they form a cacheable prefix
+        content = []
+        if instructions:
+            content.append({"text": instructions})
+            if self.prompt_caching:
+                content.append(_CACHE_POINT)
+        content.append({"text": prompt})
+        
+        # Only the messages and token limit change per call; the rest is prebuilt
+        request = dict(self._request_template)
+        request["messages"] = [{"role": "user", "content": content}]
+        request["inferenceConfig"] = {"maxTokens": max_tokens}
+        if tool:
+            request["toolConfig"] = self._tool_config(tool)
+        return request
+    
+    def _tool_config(self, tool: Dict) -> Dict:
+        """Build the Converse toolConfig that forces a tool call, once per tool"""
+        tool_config = self._tool_configs.get(tool['name'])
+        if tool_config is None:
+            tool_config = {
+                "tools": [{"toolSpec": {
+                    "name": tool['name'],
+                    "description": tool['description'],
+                    "inputSchema": {"json": tool['schema']},
+                }}],
+                "toolChoice": {"tool": {"name": tool['name']}},
+            }
+            self._tool_configs[tool['name']] = tool_config
+        return tool_config
+    
+    def _record_usage(self, usage: Dict):
+        """Accumulate token usage, including prompt cache reads and writes"""
+        with self._usage_lock:
+            for key in self.usage:
+                self.usage[key] += usage.get(key, 0) or 0
+    
+    def _record_cache_lookup(self, hit: bool):
+        """Count response cache hits and misses"""
+        with self._usage_lock:
+            self.cache_stats['hits' if hit else 'misses'] += 1
+    
+    def _parse_json_list(self, response: str, key: str) -> Optional[List]:
+        """Parse a list stored under key in a JSON object response"""
+        # Claude sometimes wraps JSON output in a markdown code fence
+        text = response.strip().removeprefix("```json").removeprefix("```").removesuffix("```")
+        try:
+            values = orjson.loads(text)[key]
+        except (orjson.JSONDecodeError, KeyError, TypeError):
             return None
+        return values if isinstance(values, list) else None
+    
+    def _parse_json_object(self, response: str) -> Optional[Dict]:
+        """Parse a JSON object from a Claude response, tolerating surrounding prose"""
+        # Claude sometimes wraps the JSON in prose or code fences, so only
+        # parse the span from the first opening to the last closing brace
+        start = response.find('{')
+        end = response.rfind('}')
+        if start == -1 or end < start:
+            return None
+        
+        try:
+            result = orjson.loads(response[start:end + 1])
+        except (orjson.JSONDecodeError, ValueError):
+            return None
+        return result if isinstance(result, dict) else None
+    
+    @classmethod
+    def _truncate_tokens(cls, text: str, n_tokens: int) -> str:
+        """Cut text to at most n_tokens tokens without splitting a word or character"""
+        if not text:
+            return ''
+        
+        if tiktoken is not None and cls._encoder is None:
+            cls._encoder = tiktoken.get_encoding('cl100k_base')
+        
+        if cls._encoder is not None:
+            tokens = cls._encoder.encode(text)
+            if len(tokens) <= n_tokens:
+                return text
+            # A cut inside a multibyte character decodes to a replacement char
+            return cls._encoder.decode(tokens[:n_tokens]).rstrip('\ufffd')
+        
+        end = 0
+        used = 0
+        for match in _TOKEN_RE.finditer(text):
+            used += -(-len(match.group()) // 4)
+            if used > n_tokens:
+                return text[:end]
+            end = match.end()
+        return text
     
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract keywords from text"""
-        words = re.findall(r'\b\w+\b', text.lower())
-        # Filter out common words
-        stop_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'a', 'an', 'is', 'are', 'was', 'were', 'how', 'what', 'when', 'where', 'why'}
-        keywords = [word for word in words if len(word) > 3 and word not in stop_words]
-        return list(set(keywords))[:10]  # Return unique keywords, max 10
+        return list(_extract_keywords_cached(text))
     
     def _get_mock_suggestions(self, video: Dict) -> Dict:
         """Generate mock suggestions when AI is not available"""
@@ -346,63 +1120,74 @@ class AIAnalyzer:
         description = video.get('description', '')
         tags = video.get('tags', [])
         
-        return {
+        # Mock output depends only on these fields, so reruns can reuse it
+        cache_key = (
+            title,
+            hashlib.blake2b((description or '').encode('utf-8'), digest_size=8).digest(),
+            tuple(tags)
+        )
+        with self._mock_lock:
+            cached = self._mock_suggestions.get(cache_key)
+            if cached is not None:
+                self._mock_suggestions.move_to_end(cache_key)
+                return copy.deepcopy(cached)
+        
+        keywords = self._extract_keywords(title)
+        
+        suggestions = MockSuggestions({
             'improved_title': self._generate_mock_title(title),
-            'improved_description': self._generate_mock_description(title, description),
-            'suggested_tags': self._generate_mock_tags(title, tags),
-            'content_ideas': self._generate_mock_content_ideas(title),
+            'improved_description': self._generate_mock_description(title, description, keywords),
+            'suggested_tags': self._generate_mock_tags(title, tags, keywords),
+            'content_ideas': self._generate_mock_content_ideas(title, keywords),
             'seo_analysis': {
                 'title_score': 7,
                 'description_score': 6,
                 'tags_score': 5,
-                'main_keywords': self._extract_keywords(title),
+                'main_keywords': keywords,
                 'missing_keywords': ['tutorial', 'guide', 'tips', 'secrets']
             }
-        }
+        })
+        
+        with self._mock_lock:
+            self._mock_suggestions[cache_key] = suggestions
+            if len(self._mock_suggestions) > MOCK_CACHE_SIZE:
+                self._mock_suggestions.popitem(last=False)
+        # Callers get their own copy so edits never leak into the cache
+        return copy.deepcopy(suggestions)
     
     def _generate_mock_title(self, current_title: str) -> str:
         """Generate a mock improved title"""
         # Add emotional triggers and numbers
-        power_words = ['Ultimate', 'Secret', 'Proven', 'Amazing', 'Incredible', 'Essential']
-        numbers = ['5', '7', '10', '15', '20']
+        power_word = _MOCK_RANDOM.choice(self.POWER_WORDS)
+        number = _MOCK_RANDOM.choice(self.NUMBERS)
         
         # Simple improvement logic
         if len(current_title) < 40:
-            return f"{power_words[0]} {current_title} - {numbers[1]} Tips You Need!"
+            return f"{power_word} {current_title} - {number} Tips You Need!"
         else:
-            return f"{numbers[2]} {power_words[1]} {current_title[:30]}... Revealed!"
+            return f"{number} {power_word} {current_title[:30]}... Revealed!"
     
-    def _generate_mock_description(self, title: str, current_desc: str) -> str:
+    def _generate_mock_description(self, title: str, current_desc: str, keywords: Optional[List[str]] = None) -> str:
         """Generate a mock improved description"""
-        hook = "🔥 Get ready to transform your understanding!"
-        keywords = self._extract_keywords(title)
+        if keywords is None:
+            keywords = self._extract_keywords(title)
         keyword_text = f"Learn about {', '.join(keywords[:3])} and more!"
         
-        cta = """
-        
-🔔 Don't forget to SUBSCRIBE for more amazing content!
-👍 LIKE this video if it helped you!
-💬 COMMENT below with your thoughts!
-        
-#trending #viral #tutorial
-        """
-        
         if len(current_desc) > 100:
-            return f"{hook}\n\n{current_desc[:200]}...\n\n{keyword_text}{cta}"
+            return f"{self.MOCK_HOOK}\n\n{current_desc[:200]}...\n\n{keyword_text}{self.MOCK_CTA}"
         else:
-            return f"{hook}\n\n{keyword_text}\n\nThis video covers everything you need to know!{cta}"
+            return f"{self.MOCK_HOOK}\n\n{keyword_text}\n\nThis video covers everything you need to know!{self.MOCK_CTA}"
     
-    def _generate_mock_tags(self, title: str, current_tags: List[str]) -> List[str]:
+    def _generate_mock_tags(self, title: str, current_tags: List[str], keywords: Optional[List[str]] = None) -> List[str]:
         """Generate mock improved tags"""
-        base_keywords = self._extract_keywords(title)
-        trending_tags = ['viral', 'trending', 'popular', 'new', 'latest', 'best', 'top', 'guide', 'tutorial', 'tips']
-        
-        suggested_tags = base_keywords + trending_tags + current_tags[:5]
-        return list(set(suggested_tags))[:12]  # Remove duplicates, max 12 tags
+        base_keywords = self._extract_keywords(title) if keywords is None else keywords
+        suggested_tags = [*base_keywords, *self.TRENDING_TAGS, *current_tags[:5]]
+        return list(dict.fromkeys(suggested_tags))[:12]  # Remove duplicates in order, max 12 tags
     
-    def _generate_mock_content_ideas(self, title: str) -> List[str]:
+    def _generate_mock_content_ideas(self, title: str, keywords: Optional[List[str]] = None) -> List[str]:
         """Generate mock content ideas"""
-        keywords = self._extract_keywords(title)
+        if keywords is None:
+            keywords = self._extract_keywords(title)
         main_topic = keywords[0] if keywords else "content"
         
         return [
@@ -416,6 +1201,7 @@ class AIAnalyzer:
     def _get_mock_deep_analysis(self, video: Dict) -> Dict:
         """Generate mock deep analysis when AI is not available"""
         title = video.get('title', 'your video')
+        keywords = self._extract_keywords(title)
         return {
             'deep_analysis': f"""
 ### 🧠 Deep Analysis & Suggestions for "{title}"
@@ -433,7 +1219,7 @@ class AIAnalyzer:
 *   **Outro**: Tease your next video.
 
 **Audience Persona**
-*   **Who they are**: Likely beginners interested in {self._extract_keywords(title)[0] if self._extract_keywords(title) else 'this topic'}.
+*   **Who they are**: Likely beginners interested in {keywords[0] if keywords else 'this topic'}.
 *   **What they want**: Quick, easy-to-understand solutions.
 *   **How to tailor**: Use simple language, avoid jargon.
 
@@ -448,3 +1234,8 @@ class AIAnalyzer:
 3.  **Offer Consulting**: Provide one-on-one help for a fee.
 """
         }
+
+@functools.lru_cache(maxsize=1)
+def get_analyzer() -> AIAnalyzer:
+    """Return the analyzer shared by the whole app; use this instead of AIAnalyzer()"""
+    return AIAnalyzer()
@@ -4,7 +4,7 @@ Demo script to showcase the YouTube Marketing Expert Agent functionality
 """
 
 from web_scraper import WebScraper
-from ai_analyzer import AIAnalyzer
+from ai_analyzer import get_analyzer
 import json
 
 def demo_web_scraper():
@@ -13,7 +13,7 @@ def demo_web_scraper():
     print("="*50)
     
     scraper = WebScraper()
-    ai_analyzer = AIAnalyzer()
+    ai_analyzer = get_analyzer()
     
     # Test URLs
     test_urls = [
@@ -1,15 +1,120 @@
 import streamlit as st
-import pandas as pd
-import json
+import numpy as np
+import orjson
 import re
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
 from web_scraper import WebScraper
-from ai_analyzer import AIAnalyzer
+from ai_analyzer import AIAnalyzer, MULTI_VIDEO_PROMPT_SIZE, MockSuggestions, get_analyzer
 from utils import format_number, validate_url, clean_text, truncate_text
-import time
+import asyncio
+import functools
+import hashlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# Concurrent Bedrock requests when analyzing a channel's videos
+AI_ANALYSIS_CONCURRENCY = 8
+
+# Worker threads for the per-video basic analysis of a channel
+BASIC_ANALYSIS_WORKERS = 8
+
+# Text feature patterns, compiled once. The description features share one
+# pattern so each description is scanned a single time for all of them
+_DIGIT_RE = re.compile(r'\d')
+_CAPS_RE = re.compile(r'[A-Z]')
+_WORD_RE = re.compile(r'\b\w+\b')
+_DESCRIPTION_FEATURES_RE = re.compile(r'(?P<links>https?://)|(?P<timestamps>\d{1,2}:\d{2})|(?P<hashtags>#(?=\w))')
+
+@st.cache_resource
+def get_scraper() -> WebScraper:
+    """Shared web scraper so its HTTP session survives Streamlit reruns"""
+    return WebScraper()
+
+@st.cache_resource
+def get_ai_analyzer() -> AIAnalyzer:
+    """Shared AI analyzer so its Bedrock client survives Streamlit reruns"""
+    return get_analyzer()
+
+class _UncachedResult(Exception):
+    """Carries a result out of a st.cache_data function without caching it"""
+    def __init__(self, result: Dict):
+        super().__init__()
+        self.result = result
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _cached_analyze_url(url: str) -> Dict:
+    url_data = get_scraper().analyze_url(url)
+    if 'error' in url_data:
+        # Don't pin a transient scrape failure for the next hour
+        raise _UncachedResult(url_data)
+    return url_data
+
+def cached_analyze_url(url: str) -> Dict:
+    """Scrape a URL, reusing the result when the same URL is submitted again"""
+    try:
+        return _cached_analyze_url(url)
+    except _UncachedResult as e:
+        return e.result
+
+def _is_ai_failure(suggestions: Dict) -> bool:
+    """Empty or mock suggestions mean Claude did not answer"""
+    return not suggestions or isinstance(suggestions, MockSuggestions)
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _cached_ai_analyze(video: Dict) -> Dict:
+    suggestions = get_ai_analyzer().analyze_video(video)
+    if _is_ai_failure(suggestions):
+        # A throttled or failed request should be retried on the next submit
+        raise _UncachedResult(suggestions)
+    return suggestions
+
+def cached_ai_analyze(video: Dict) -> Dict:
+    """AI suggestions for a video, reused across reruns while its metadata is unchanged"""
+    try:
+        return _cached_ai_analyze(video)
+    except _UncachedResult as e:
+        return e.result
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _cached_ai_analyze_group(videos: List[Dict]) -> List[Dict]:
+    results = get_ai_analyzer().analyze_video_group(videos)
+    if any(_is_ai_failure(suggestions) for suggestions in results):
+        # Videos that did get answers stay in the analyzer's response cache for the retry
+        raise _UncachedResult(results)
+    return results
+
+def cached_ai_analyze_group(videos: List[Dict]) -> List[Dict]:
+    """AI suggestions for a few videos sharing one Bedrock request, reused across reruns"""
+    try:
+        return _cached_ai_analyze_group(videos)
+    except _UncachedResult as e:
+        return e.result
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _cached_ai_analyze_website(cache_key: str, _pseudo_video: Dict) -> Dict:
+    suggestions = get_ai_analyzer().analyze_video(_pseudo_video)
+    if _is_ai_failure(suggestions):
+        raise _UncachedResult(suggestions)
+    return suggestions
+
+def cached_ai_analyze_website(cache_key: str, pseudo_video: Dict) -> Dict:
+    """AI suggestions for a website; Streamlit hashes only the short key, not the page data"""
+    try:
+        return _cached_ai_analyze_website(cache_key, pseudo_video)
+    except _UncachedResult as e:
+        return e.result
+
+def website_cache_key(website_data: Dict) -> str:
+    """Digest of the page fields the AI analysis reads"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (website_data.get('webpage_url', ''), website_data.get('title', ''),
+                 website_data.get('description', ''), *website_data.get('keywords', [])):
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
 
 # Page configuration
 st.set_page_config(
@@ -20,7 +125,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+_CSS = """
 <style>
     .main {
         padding-top: 1rem;
@@ -44,7 +149,11 @@ st.markdown("""
         margin: 1rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Streamlit drops any element a rerun doesn't emit again, so the styles have
+# to be re-sent each run; only the string itself is built once
+st.markdown(_CSS, unsafe_allow_html=True)
 
 def main():
     # Header
@@ -56,8 +165,8 @@ def main():
         st.header("⚙️ Configuration")
         
         # API Status
-        web_scraper = WebScraper()
-        ai_analyzer = AIAnalyzer()
+        web_scraper = get_scraper()
+        ai_analyzer = get_ai_analyzer()
         
         scraper_status = "✅ Ready" if web_scraper.is_configured() else "❌ Not available"
         ai_status = "✅ Connected" if ai_analyzer.is_configured() else "❌ Not configured"
@@ -109,8 +218,9 @@ def main():
                 st.metric("Title Length", results['summary']['title_length'])
                 st.metric("Images", results['summary']['images_count'])
     
-    # Analysis section
-    if analyze_button and url_input:
+    # Analysis section; skip the work when these exact results are already on screen
+    analysis_key = (url_input, max_videos, include_shorts, detailed_analysis)
+    if analyze_button and url_input and st.session_state.get('last_analysis_key') != analysis_key:
         if not validate_url(url_input):
             st.error("❌ Invalid URL. Please enter a valid website URL.")
             return
@@ -120,8 +230,11 @@ def main():
             st.error("❌ Web scraper is not available.")
             return
         
-        # Analyze the URL
+        # Analyze the URL, remembering it only if it produced new results
+        previous_results = st.session_state.get('analysis_results')
         analyze_url(web_scraper, ai_analyzer, url_input, max_videos, include_shorts, detailed_analysis, use_selenium)
+        if st.session_state.get('analysis_results') is not previous_results:
+            st.session_state.last_analysis_key = analysis_key
     
     # Display results if available
     if 'analysis_results' in st.session_state:
@@ -132,7 +245,7 @@ def analyze_url(web_scraper: WebScraper, ai_analyzer: AIAnalyzer, url: str, max_
     
     with st.spinner("🔍 Analyzing URL..."):
         # Analyze the URL
-        url_data = web_scraper.analyze_url(url)
+        url_data = cached_analyze_url(url)
         if 'error' in url_data:
             st.error(f"❌ Error analyzing URL: {url_data['error']}")
             return
@@ -168,7 +281,7 @@ def analyze_single_video(video_data: Dict, ai_analyzer: AIAnalyzer, detailed_ana
     # AI analysis if enabled
     if detailed_analysis and ai_analyzer.is_configured():
         with st.spinner("🤖 Generating AI suggestions..."):
-            ai_suggestions = ai_analyzer.analyze_video(video_data)
+            ai_suggestions = cached_ai_analyze(video_data)
             analysis_results['videos'][0]['ai_suggestions'] = ai_suggestions
     
     # Calculate summary stats
@@ -201,51 +314,63 @@ def analyze_youtube_channel(web_scraper: WebScraper, ai_analyzer: AIAnalyzer, ch
     progress_bar = st.progress(0)
     status_text = st.empty()
     
+    # Basic analysis; each video is independent, map keeps the original order
+    with ThreadPoolExecutor(max_workers=min(BASIC_ANALYSIS_WORKERS, len(detailed_videos))) as executor:
+        video_analyses = list(executor.map(analyze_video_basic, detailed_videos))
+    
     analysis_results = {
         'content_type': 'channel',
         'channel_info': channel_data,
-        'videos': [],
+        'videos': video_analyses,
         'summary': {
             'total_videos': len(detailed_videos),
-            'total_views': 0,
+            'total_views': sum(v['views'] for v in video_analyses),
             'avg_engagement': 0,
             'top_performing': None,
             'optimization_opportunities': 0
         }
     }
     
-    for i, video in enumerate(detailed_videos):
-        progress = (i + 1) / len(detailed_videos)
-        progress_bar.progress(progress)
-        status_text.text(f"Analyzing video {i+1}/{len(detailed_videos)}: {truncate_text(video.get('title', ''), 50)}")
-        
-        # Basic analysis
-        video_analysis = analyze_video_basic(video)
+    # AI analysis if enabled, with the Bedrock requests for all videos in flight together
+    if detailed_analysis and ai_analyzer.is_configured():
+        def show_progress(completed: int, video: Dict):
+            progress_bar.progress(completed / len(detailed_videos))
+            status_text.text(f"Analyzed video {completed}/{len(detailed_videos)}: {truncate_text(video.get('title', ''), 50)}")
         
-        # AI analysis if enabled
-        if detailed_analysis and ai_analyzer.is_configured():
-            ai_suggestions = ai_analyzer.analyze_video(video)
+        all_suggestions = asyncio.run(analyze_videos_concurrently(detailed_videos, show_progress))
+        for video_analysis, ai_suggestions in zip(video_analyses, all_suggestions):
             video_analysis['ai_suggestions'] = ai_suggestions
-        
-        analysis_results['videos'].append(video_analysis)
-        analysis_results['summary']['total_views'] += video_analysis['views']
-        
-        # Small delay to prevent overwhelming the system
-        time.sleep(0.1)
     
     # Calculate summary statistics
     calculate_summary_stats(analysis_results)
     
-    progress_bar.progress(1.0)
-    status_text.text("✅ Analysis complete!")
-    
     st.session_state.analysis_results = analysis_results
     
-    # Clear progress indicators after a short delay
-    time.sleep(1)
+    # Clear progress indicators; the results view replaces them on the next render
     progress_bar.empty()
     status_text.empty()
 
+async def analyze_videos_concurrently(videos: List[Dict], on_progress) -> List[Dict]:
+    """Run AI analysis for many videos at once, a few per request, reporting progress as each group finishes"""
+    semaphore = asyncio.Semaphore(AI_ANALYSIS_CONCURRENCY)
+    
+    async def analyze(start: int):
+        async with semaphore:
+            group = videos[start:start + MULTI_VIDEO_PROMPT_SIZE]
+            return start, await asyncio.to_thread(cached_ai_analyze_group, group)
+    
+    results = [None] * len(videos)
+    tasks = [analyze(start) for start in range(0, len(videos), MULTI_VIDEO_PROMPT_SIZE)]
+    completed = 0
+    for task in asyncio.as_completed(tasks):
+        start, group_suggestions = await task
+        for index, suggestions in enumerate(group_suggestions, start):
+            results[index] = suggestions
+            completed += 1
+            # Runs on the script thread, so Streamlit elements can be updated here
+            on_progress(completed, videos[index])
+    return results
+
 def analyze_website(website_data: Dict, ai_analyzer: AIAnalyzer, detailed_analysis: bool):
     """Analyze a general website"""
     
@@ -261,7 +386,7 @@ def analyze_website(website_data: Dict, ai_analyzer: AIAnalyzer, detailed_analys
         'summary': {
             'title_length': len(title),
             'description_length': len(website_data.get('description', '')),
-            'headings_count': sum(len(h) for h in website_data.get('headings', {}).values()),
+            'headings_count': sum(map(len, website_data.get('headings', {}).values())),
             'images_count': website_data.get('images', 0),
             'links_count': website_data.get('links', 0)
         }
@@ -280,7 +405,7 @@ def analyze_website(website_data: Dict, ai_analyzer: AIAnalyzer, detailed_analys
                 'commentCount': 0,
                 'duration': '0:00'
             }
-            ai_suggestions = ai_analyzer.analyze_video(pseudo_video)
+            ai_suggestions = cached_ai_analyze_website(website_cache_key(website_data), pseudo_video)
             analysis_results['ai_suggestions'] = ai_suggestions
     
     st.session_state.analysis_results = analysis_results
@@ -303,8 +428,8 @@ def analyze_video_basic(video: Dict) -> Dict:
     title_analysis = {
         'length': len(title),
         'word_count': len(title.split()),
-        'has_numbers': bool(re.search(r'\d', title)),
-        'has_caps': bool(re.search(r'[A-Z]', title)),
+        'has_numbers': _DIGIT_RE.search(title) is not None,
+        'has_caps': _CAPS_RE.search(title) is not None,
         'has_question': '?' in title,
         'has_exclamation': '!' in title,
         'keyword_density': calculate_keyword_density(title)
@@ -314,18 +439,23 @@ def analyze_video_basic(video: Dict) -> Dict:
     desc_analysis = {
         'length': len(description),
         'word_count': len(description.split()),
-        'has_links': bool(re.search(r'http[s]?://', description)),
-        'has_timestamps': bool(re.search(r'\d{1,2}:\d{2}', description)),
-        'has_hashtags': bool(re.search(r'#\w+', description)),
-        'line_count': len(description.split('\n'))
+        **scan_description_features(description),
+        'line_count': description.count('\n') + 1
     }
     
-    # Tags analysis
+    # Tags analysis, in a single pass over the tags
+    total_tag_chars = 0
+    unique_tag_words = set()
+    for tag in tags:
+        tag = str(tag)
+        total_tag_chars += len(tag)
+        unique_tag_words.update(tag.lower().split())
+    
     tags_analysis = {
         'count': len(tags),
-        'total_characters': sum(len(str(tag)) for tag in tags),
-        'avg_length': sum(len(str(tag)) for tag in tags) / max(len(tags), 1),
-        'unique_words': len(set(' '.join(str(tag) for tag in tags).lower().split()))
+        'total_characters': total_tag_chars,
+        'avg_length': total_tag_chars / max(len(tags), 1),
+        'unique_words': len(unique_tag_words)
     }
     
     # Basic optimization score
@@ -351,54 +481,54 @@ def analyze_video_basic(video: Dict) -> Dict:
         'basic_suggestions': generate_basic_suggestions(title_analysis, desc_analysis, tags_analysis)
     }
 
+def scan_description_features(description: str) -> Dict[str, bool]:
+    """Detect links, timestamps and hashtags in one pass over the description"""
+    features = {'has_links': False, 'has_timestamps': False, 'has_hashtags': False}
+    for match in _DESCRIPTION_FEATURES_RE.finditer(description):
+        features['has_' + match.lastgroup] = True
+        if all(features.values()):
+            break
+    return features
+
 def calculate_keyword_density(text: str) -> Dict:
     """Calculate keyword density for text"""
-    words = re.findall(r'\b\w+\b', text.lower())
+    # Titles are re-analyzed on every rerun; hand each caller its own dict
+    return dict(_keyword_density_items(text))
+
+@functools.lru_cache(maxsize=512)
+def _keyword_density_items(text: str) -> Tuple[Tuple[str, float], ...]:
+    words = _WORD_RE.findall(text.lower())
     if not words:
-        return {}
+        return ()
     
-    word_count = {}
-    for word in words:
-        if len(word) > 3:  # Only count words longer than 3 characters
-            word_count[word] = word_count.get(word, 0) + 1
+    # Only count words longer than 3 characters
+    word_count = Counter(word for word in words if len(word) > 3)
     
-    total_words = len(words)
-    return {word: (count / total_words) * 100 for word, count in word_count.items()}
+    percent_per_word = 100.0 / len(words)
+    return tuple((word, count * percent_per_word) for word, count in word_count.items())
 
 def calculate_optimization_score(title_analysis: Dict, desc_analysis: Dict, tags_analysis: Dict) -> float:
     """Calculate basic optimization score"""
-    score = 0
     max_score = 100
     
-    # Title scoring (40 points max)
-    if 40 <= title_analysis['length'] <= 60:
-        score += 15
-    if title_analysis['has_numbers']:
-        score += 5
-    if title_analysis['has_question'] or title_analysis['has_exclamation']:
-        score += 10
-    if 6 <= title_analysis['word_count'] <= 10:
-        score += 10
-    
-    # Description scoring (35 points max)
-    if desc_analysis['length'] >= 200:
-        score += 15
-    if desc_analysis['has_links']:
-        score += 5
-    if desc_analysis['has_timestamps']:
-        score += 5
-    if desc_analysis['has_hashtags']:
-        score += 5
-    if desc_analysis['line_count'] >= 3:
-        score += 5
-    
-    # Tags scoring (25 points max)
-    if tags_analysis['count'] >= 5:
-        score += 10
-    if tags_analysis['count'] <= 15:
-        score += 10
-    if 5 <= tags_analysis['avg_length'] <= 20:
-        score += 5
+    # Each check contributes its points as a bool-weighted term, no branching
+    score = (
+        # Title scoring (40 points max)
+        15 * (40 <= title_analysis['length'] <= 60)
+        + 5 * title_analysis['has_numbers']
+        + 10 * (title_analysis['has_question'] or title_analysis['has_exclamation'])
+        + 10 * (6 <= title_analysis['word_count'] <= 10)
+        # Description scoring (35 points max)
+        + 15 * (desc_analysis['length'] >= 200)
+        + 5 * desc_analysis['has_links']
+        + 5 * desc_analysis['has_timestamps']
+        + 5 * desc_analysis['has_hashtags']
+        + 5 * (desc_analysis['line_count'] >= 3)
+        # Tags scoring (25 points max)
+        + 10 * (tags_analysis['count'] >= 5)
+        + 10 * (tags_analysis['count'] <= 15)
+        + 5 * (5 <= tags_analysis['avg_length'] <= 20)
+    )
     
     return min(score, max_score)
 
@@ -445,17 +575,18 @@ def calculate_summary_stats(analysis_results: Dict):
     if not videos:
         return
     
+    # Pack the per-video numbers into arrays once and reduce them in C
+    engagement = np.fromiter((v['engagement_rate'] for v in videos), dtype=np.float64, count=len(videos))
+    suggestion_counts = np.fromiter((len(v['basic_suggestions']) for v in videos), dtype=np.int32, count=len(videos))
+    
     # Find top performing video
-    top_video = max(videos, key=lambda x: x['engagement_rate'])
-    analysis_results['summary']['top_performing'] = top_video
+    analysis_results['summary']['top_performing'] = videos[int(engagement.argmax())]
     
     # Calculate average engagement
-    avg_engagement = sum(v['engagement_rate'] for v in videos) / len(videos)
-    analysis_results['summary']['avg_engagement'] = avg_engagement
+    analysis_results['summary']['avg_engagement'] = float(engagement.mean())
     
     # Count optimization opportunities
-    opportunities = sum(len(v['basic_suggestions']) for v in videos)
-    analysis_results['summary']['optimization_opportunities'] = opportunities
+    analysis_results['summary']['optimization_opportunities'] = int(suggestion_counts.sum())
 
 def display_analysis_results(results: Dict, export_json: bool, export_pdf: bool):
     """Display analysis results"""
@@ -521,31 +652,27 @@ def display_channel_results(results: Dict):
     if len(results['videos']) > 1:
         st.subheader("📈 Performance Overview")
         
-        videos_data = []
-        for video in results['videos']:
-            videos_data.append({
-                'Title': truncate_text(video['title'], 30),
-                'Views': video['views'],
-                'Engagement Rate': video['engagement_rate'],
-                'Optimization Score': video['optimization_score']
-            })
-        
-        df = pd.DataFrame(videos_data)
+        # The chart only needs four columns, so build them directly
+        videos = results['videos']
+        titles = [truncate_text(video['title'], 30) for video in videos]
+        views = np.fromiter((video['views'] for video in videos), dtype=np.int64, count=len(videos))
+        engagement = np.fromiter((video['engagement_rate'] for video in videos), dtype=np.float64, count=len(videos))
+        scores = np.fromiter((video['optimization_score'] for video in videos), dtype=np.float64, count=len(videos))
         
         # Create performance chart
         fig = go.Figure()
         fig.add_trace(go.Scatter(
-            x=df['Views'],
-            y=df['Engagement Rate'],
+            x=views,
+            y=engagement,
             mode='markers',
             marker=dict(
-                size=df['Optimization Score'] / 5,
-                color=df['Optimization Score'],
+                size=scores / 5,
+                color=scores,
                 colorscale='RdYlGn',
                 showscale=True,
                 colorbar=dict(title="Optimization Score")
             ),
-            text=df['Title'],
+            text=titles,
             hovertemplate='<b>%{text}</b><br>Views: %{x}<br>Engagement: %{y:.2f}%<br>Score: %{marker.color}<extra></extra>'
         ))
         
@@ -735,25 +862,31 @@ def display_video_analysis(video: Dict):
                 st.markdown(f"• {idea}")
 
     # Deep analysis button
+    deep_analysis_key = f"deep_analysis_content_{video['video_id']}"
     if st.button("🔬 Get Deep Analysis", key=f"deep_analysis_button_{video['video_id']}"):
-        with st.spinner("🧠 Performing deep analysis..."):
-            ai_analyzer = AIAnalyzer()
-            deep_analysis = ai_analyzer.get_deep_analysis(video)
-            st.session_state[f"deep_analysis_content_{video['video_id']}"] = deep_analysis.get('deep_analysis', 'No analysis available.')
-            # No need to rerun, Streamlit's state management handles the update.
+        ai_analyzer = get_ai_analyzer()
+        st.markdown("---")
+        st.markdown("### 🧠 Deep Analysis & Suggestions")
+        # Render the analysis as it is generated instead of waiting for all of it
+        deep_analysis = st.write_stream(ai_analyzer.get_deep_analysis_stream(video))
+        st.session_state[deep_analysis_key] = deep_analysis or 'No analysis available.'
 
     # Display deep analysis if available
-    if f"deep_analysis_content_{video['video_id']}" in st.session_state:
+    elif deep_analysis_key in st.session_state:
         st.markdown("---")
         st.markdown("### 🧠 Deep Analysis & Suggestions")
-        st.markdown(st.session_state[f"deep_analysis_content_{video['video_id']}"], unsafe_allow_html=True)
+        st.markdown(st.session_state[deep_analysis_key], unsafe_allow_html=True)
 
 
 def export_results(results: Dict, export_json: bool, export_pdf: bool):
     """Export analysis results"""
     
     if export_json:
-        json_data = json.dumps(results, indent=2, default=str)
+        json_data = orjson.dumps(
+            results,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            default=str
+        )
         st.download_button(
             label="📄 Download JSON Report",
             data=json_data,
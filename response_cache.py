@@ -0,0 +1,119 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class ResponseCache:
+    """Bounded LRU cache of Claude responses keyed by exact prompt"""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> response
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build an exact-match cache key from prompt parts"""
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\x00')
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for an exact key"""
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def set(self, key: str, response: str):
+        """Store a response, evicting the least recently used ones beyond the limit"""
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskResponseCache:
+    """Exact-match Claude responses persisted in SQLite so they survive restarts"""
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 60 * 60, max_entries: int = 100_000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # One connection shared by every thread, serialized by the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored response for a key unless it has expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return row[0]
+
+    def set(self, key: str, response: str):
+        """Store a response until the TTL passes, evicting the least recently used"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, response, now + self.ttl, now)
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        """Remove every stored response"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
@@ -5,32 +5,35 @@ Test script to verify the YouTube Marketing Expert Agent setup
 
 import os
 import sys
+import importlib.util
 from dotenv import load_dotenv
 
 def test_dependencies():
     """Test if all required packages are installed"""
     print("🔍 Testing dependencies...")
     
-    required_packages = [
-        'streamlit',
-        'pandas',
-        'boto3',
-        'plotly',
-        'requests',
-        'beautifulsoup4',
-        'yt_dlp',
-        'selenium',
-        'webdriver_manager',
-        'dotenv'
-    ]
+    # pip package name -> module name to look for
+    required_packages = {
+        'streamlit': 'streamlit',
+        'numpy': 'numpy',
+        'orjson': 'orjson',
+        'boto3': 'boto3',
+        'plotly': 'plotly',
+        'requests': 'requests',
+        'beautifulsoup4': 'bs4',
+        'yt-dlp': 'yt_dlp',
+        'selenium': 'selenium',
+        'webdriver-manager': 'webdriver_manager',
+        'python-dotenv': 'dotenv'
+    }
     
     missing_packages = []
     
-    for package in required_packages:
-        try:
-            __import__(package)
+    # find_spec locates each package without running its (often slow) import
+    for package, module in required_packages.items():
+        if importlib.util.find_spec(module) is not None:
             print(f"✅ {package}")
-        except ImportError:
+        else:
             print(f"❌ {package}")
             missing_packages.append(package)
     
@@ -56,8 +59,10 @@ def test_environment_variables():
     
     missing_vars = []
     
+    # Snapshot the environment once rather than going through os.environ per lookup
+    env = dict(os.environ)
     for var, description in required_vars.items():
-        value = os.getenv(var)
+        value = env.get(var)
         if value and value != f'your_{var.lower()}_here':
             print(f"✅ {var} configured")
         else:
@@ -202,28 +207,37 @@ def main():
             print(f"❌ Test failed with exception: {str(e)}")
             results.append(False)
     
-    print("\n" + "="*50)
-    print("📊 TEST SUMMARY")
-    print("="*50)
-    
     passed = sum(results)
     total = len(results)
     
-    print(f"Tests passed: {passed}/{total}")
+    # Build the summary and emit it in one write
+    report = [
+        "\n" + "="*50,
+        "📊 TEST SUMMARY",
+        "="*50,
+        f"Tests passed: {passed}/{total}",
+    ]
     
     if passed == total:
-        print("🎉 All tests passed! Your setup is ready.")
-        print("\nYou can now run the application with:")
-        print("streamlit run main.py")
+        report += [
+            "🎉 All tests passed! Your setup is ready.",
+            "\nYou can now run the application with:",
+            "streamlit run main.py",
+        ]
     else:
-        print("⚠️  Some tests failed. Please check the issues above.")
-        print("The application may still work in limited mode.")
-    
-    print("\n💡 Tips:")
-    print("- Make sure your .env file has valid API credentials")
-    print("- YouTube API has daily quotas - be mindful of usage")
-    print("- AWS Bedrock requires model access approval")
-    print("- The app works in mock mode if AI is not configured")
+        report += [
+            "⚠️  Some tests failed. Please check the issues above.",
+            "The application may still work in limited mode.",
+        ]
+    
+    report += [
+        "\n💡 Tips:",
+        "- Make sure your .env file has valid API credentials",
+        "- YouTube API has daily quotas - be mindful of usage",
+        "- AWS Bedrock requires model access approval",
+        "- The app works in mock mode if AI is not configured",
+    ]
+    print(*report, sep="\n")
 
 if __name__ == "__main__":
     main()
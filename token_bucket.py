@@ -0,0 +1,27 @@
+import threading
+import time
+
+class TokenBucket:
+    """Thread-safe token bucket that spaces out calls to a rate-limited API"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1):
+        """Block until enough tokens have accumulated, then take them"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+
+            # Sleep outside the lock so other threads can refill and check too
+            time.sleep(wait)
@@ -1,167 +1,213 @@
 import re
-from typing import Optional
+import string
+import functools
+from bisect import bisect_right
+from datetime import datetime
+from typing import Iterator, Optional, Tuple
 from urllib.parse import urlparse, parse_qs
 
+
+# URL and email checks are memoized with lru_cache(maxsize=2048): the same
+# URLs come back on every rerun and retry, and the size bounds the memory
+
+# Longest URL validate_url accepts, the practical browser limit
+MAX_URL_LENGTH = 2048
+
+# Patterns used by the helpers below, compiled once at import
+_HOST_RE = re.compile(r'[a-z0-9.-]+')
+_HASHTAG_RE = re.compile(r'#\w+')
+_MENTION_RE = re.compile(r'@\w+')
+_URLS_RE = re.compile(r'https?://[^\s<>"\'{}|\\^`\[\]]+')
+_VIDEO_ID_RE = re.compile(
+    r'(?:youtube\.com/(?:watch\?(?:.*&)?v=|embed/|shorts/)|youtu\.be/)([a-zA-Z0-9_-]{11})', re.ASCII
+)
+_DURATION_PART_RE = re.compile(r'(\d+)([hms])')
+_DOTS_RE = re.compile(r'\.+')
+_REPORT_NAME_INVALID_RE = re.compile(r'[^\w\s-]')
+_REPORT_NAME_SEPARATORS_RE = re.compile(r'[-\s]+')
+
+_DURATION_UNIT_SECONDS = {'h': 3600, 'm': 60, 's': 1}
+
+# Characters allowed on each side of an email's @
+_EMAIL_LOCAL_CHARS = frozenset(string.ascii_letters + string.digits + '._%+-')
+_EMAIL_DOMAIN_CHARS = frozenset(string.ascii_letters + string.digits + '.-')
+
+# Characters of an 11-character YouTube video ID, and the URL markers that
+# directly precede one in the two most common link formats
+_VIDEO_ID_CHARS = frozenset(string.ascii_letters + string.digits + '_-')
+_VIDEO_ID_MARKERS = ('youtube.com/watch?v=', 'youtu.be/')
+
+# Default truncate_text suffix and its precomputed length
+_DEFAULT_TRUNCATE_SUFFIX = "..."
+_DEFAULT_TRUNCATE_SUFFIX_LEN = len(_DEFAULT_TRUNCATE_SUFFIX)
+
+# Characters not allowed in file names, each replaced with an underscore
+_FILENAME_INVALID_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+
+# Ascending lower bounds and the value for each band; band i covers
+# [bounds[i-1], bounds[i]), so bisect_right picks it in one call
+_NUMBER_BOUNDS = (1_000, 1_000_000, 1_000_000_000)
+_NUMBER_UNITS = ((1, ''), (1_000, 'K'), (1_000_000, 'M'), (1_000_000_000, 'B'))
+_ENGAGEMENT_BOUNDS = (1, 2, 5, 10)
+_ENGAGEMENT_LABELS = ("Poor", "Below Average", "Average", "Good", "Excellent")
+_OPTIMIZATION_BOUNDS = (40, 60, 80)
+_OPTIMIZATION_LABELS = ("Poor", "Needs Improvement", "Good", "Excellent")
+
+# Control characters clean_text deletes; the ones str.split() treats as
+# whitespace are left in so they collapse to a space like other whitespace
+_CONTROL_CHARS_TABLE = dict.fromkeys(
+    code for code in (*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), *range(0x7f, 0xa0))
+    if not chr(code).isspace()
+)
+
+@functools.lru_cache(maxsize=2048)
 def format_number(num: int) -> str:
     """Format large numbers with K, M, B suffixes"""
-    if num >= 1_000_000_000:
-        return f"{num / 1_000_000_000:.1f}B"
-    elif num >= 1_000_000:
-        return f"{num / 1_000_000:.1f}M"
-    elif num >= 1_000:
-        return f"{num / 1_000:.1f}K"
-    else:
+    band = bisect_right(_NUMBER_BOUNDS, num)
+    if band == 0:
         return str(num)
+    divisor, suffix = _NUMBER_UNITS[band]
+    return f"{num / divisor:.1f}{suffix}"
 
+@functools.lru_cache(maxsize=2048)
 def validate_url(url: str) -> bool:
     """Validate if URL is a valid URL"""
-    if not url:
+    # Cheap rejections first: wrong scheme, or too long to be a real URL
+    if not url or len(url) > MAX_URL_LENGTH or not url[:8].lower().startswith(('http://', 'https://')):
+        return False
+    
+    # Structural checks on the parsed URL; no whitespace anywhere, like before
+    if len(url.split()) != 1:
         return False
     
-    # Basic URL validation
-    url_pattern = re.compile(
-        r'^https?://'  # http:// or https://
-        r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,6}\.?|'  # domain...
-        r'localhost|'  # localhost...
-        r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
-        r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+)$', re.IGNORECASE)
+    try:
+        parsed = urlparse(url)
+        parsed.port  # raises ValueError for a malformed port
+    except ValueError:
+        return False
+    
+    host = parsed.hostname
+    if parsed.scheme not in ('http', 'https') or not host:
+        return False
     
-    return url_pattern.match(url) is not None
+    # A dotted domain or IPv4 address, or localhost
+    return host == 'localhost' or ('.' in host and _HOST_RE.fullmatch(host) is not None)
 
-def extract_channel_id(url: str) -> Optional[str]:
-    """Extract channel ID from various YouTube URL formats"""
+# Channel URL path prefixes and the kind of identifier that follows each
+_YOUTUBE_PATH_KINDS = (
+    ('/channel/', 'channel_id'),  # /channel/UCxxxx
+    ('/c/', 'custom'),            # /c/channelname
+    ('/user/', 'user'),           # /user/username
+    ('/@', 'handle'),             # /@handle
+)
+
+@functools.lru_cache(maxsize=2048)
+def classify_youtube_url(url: str) -> Tuple[Optional[str], Optional[str]]:
+    """Parse a YouTube channel URL once into (kind, value), or (None, None)"""
     if not url:
-        return None
+        return None, None
     
-    # Parse URL
     parsed = urlparse(url)
+    if 'youtube.com' not in parsed.netloc:
+        return None, None
     
-    # Handle different URL formats
-    if 'youtube.com' in parsed.netloc:
-        path = parsed.path
-        
-        # Format: /channel/UCxxxx
-        if path.startswith('/channel/'):
-            return path.split('/channel/')[1].split('/')[0]
-        
-        # Format: /c/channelname or /user/username
-        elif path.startswith('/c/') or path.startswith('/user/'):
-            # These need to be resolved via API
-            return None  # Will be handled by username lookup
-        
-        # Format: /@handle
-        elif path.startswith('/@'):
-            # This needs to be resolved via API search
-            return None  # Will be handled by handle search
-        
-        # Format: /channelname (old format)
-        elif path and len(path) > 1:
-            # This might be a custom URL, needs API resolution
-            return None
+    path = parsed.path
+    for prefix, kind in _YOUTUBE_PATH_KINDS:
+        if path.startswith(prefix):
+            return kind, path[len(prefix):].split('/')[0]
+    
+    # Format: /channelname (old custom URL)
+    if len(path) > 1:
+        return 'custom', path.split('/')[1]
     
-    # If we can't extract directly, return None and let API handle it
-    return None
+    return None, None
+
+def extract_channel_id(url: str) -> Optional[str]:
+    """Extract channel ID from various YouTube URL formats"""
+    # Only /channel/ URLs carry the ID; the other formats need API resolution
+    kind, value = classify_youtube_url(url)
+    return value if kind == 'channel_id' else None
 
 def extract_username_or_handle(url: str) -> Optional[str]:
     """Extract username or handle from YouTube URL"""
-    if not url:
-        return None
-    
-    parsed = urlparse(url)
-    
-    if 'youtube.com' in parsed.netloc:
-        path = parsed.path
-        
-        # Format: /c/channelname
-        if path.startswith('/c/'):
-            return path.split('/c/')[1].split('/')[0]
-        
-        # Format: /user/username
-        elif path.startswith('/user/'):
-            return path.split('/user/')[1].split('/')[0]
-        
-        # Format: /@handle
-        elif path.startswith('/@'):
-            return path.split('/@')[1].split('/')[0]
-        
-        # Format: /channelname (old custom URL)
-        elif path and len(path) > 1 and not path.startswith('/channel/'):
-            return path.split('/')[1].split('/')[0]
-    
-    return None
+    kind, value = classify_youtube_url(url)
+    return value if kind in ('custom', 'user', 'handle') else None
 
 def clean_text(text: str) -> str:
     """Clean text by removing extra whitespace and special characters"""
     if not text:
         return ""
     
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text.strip())
-    
-    # Remove control characters
-    text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', text)
-    
-    return text
+    # Remove control characters, then collapse whitespace runs to single spaces
+    return ' '.join(text.translate(_CONTROL_CHARS_TABLE).split())
 
-def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
+@functools.lru_cache(maxsize=2048)
+def truncate_text(text: str, max_length: int = 100, suffix: str = _DEFAULT_TRUNCATE_SUFFIX) -> str:
     """Truncate text to specified length"""
     if not text or len(text) <= max_length:
         return text
     
-    return text[:max_length - len(suffix)] + suffix
+    # Callers almost always keep the default suffix, whose length is known
+    keep = max_length - (_DEFAULT_TRUNCATE_SUFFIX_LEN if suffix is _DEFAULT_TRUNCATE_SUFFIX else len(suffix))
+    return text[:keep] + suffix
 
 def extract_hashtags(text: str) -> list:
     """Extract hashtags from text"""
-    if not text:
+    # A substring check is far cheaper than a regex scan of text with no tags
+    if not text or '#' not in text:
         return []
     
-    hashtags = re.findall(r'#\w+', text)
+    hashtags = _HASHTAG_RE.findall(text)
     return [tag.lower() for tag in hashtags]
 
 def extract_mentions(text: str) -> list:
     """Extract @mentions from text"""
-    if not text:
+    if not text or '@' not in text:
         return []
     
-    mentions = re.findall(r'@\w+', text)
+    mentions = _MENTION_RE.findall(text)
     return [mention.lower() for mention in mentions]
 
+def iter_urls(text: str) -> Iterator[str]:
+    """Yield URLs from text one at a time, so callers can stop early"""
+    if not text or 'http' not in text:
+        return iter(())
+    
+    return (match.group(0) for match in _URLS_RE.finditer(text))
+
 def extract_urls(text: str) -> list:
     """Extract URLs from text"""
-    if not text:
-        return []
-    
-    url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-    urls = re.findall(url_pattern, text)
-    return urls
+    return list(iter_urls(text))
 
 def calculate_reading_time(text: str, words_per_minute: int = 200) -> int:
     """Calculate estimated reading time in minutes"""
     if not text:
         return 0
     
+    # Every word needs a character plus a separator, so text this short can't
+    # round past one minute; skip splitting it into a word list
+    if (len(text) + 1) // 2 < 1.5 * words_per_minute:
+        return 1
+    
     word_count = len(text.split())
     reading_time = max(1, round(word_count / words_per_minute))
     return reading_time
 
+@functools.lru_cache(maxsize=2048)
 def extract_video_id_from_url(url: str) -> Optional[str]:
     """Extract video ID from YouTube video URL"""
     if not url:
         return None
     
-    # Various YouTube URL patterns
-    patterns = [
-        r'(?:youtube\.com\/watch\?v=|youtu\.be\/|youtube\.com\/embed\/)([a-zA-Z0-9_-]{11})',
-        r'youtube\.com\/watch\?.*v=([a-zA-Z0-9_-]{11})',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
+    # Plain watch?v= and youtu.be/ links need only a slice
+    for marker in _VIDEO_ID_MARKERS:
+        candidate = url.partition(marker)[2][:11]
+        if len(candidate) == 11 and _VIDEO_ID_CHARS.issuperset(candidate):
+            return candidate
     
-    return None
+    # watch?...&v=, embed/ and shorts/ URLs in one search
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else None
 
 def format_duration(seconds: int) -> str:
     """Format duration in seconds to human readable format"""
@@ -191,63 +237,27 @@ def parse_duration_to_seconds(duration_str: str) -> int:
     # Handle format like "1:30" or "1:30:45"
     if ':' in duration_str:
         parts = duration_str.split(':')
-        if len(parts) == 2:  # MM:SS
-            return int(parts[0]) * 60 + int(parts[1])
-        elif len(parts) == 3:  # HH:MM:SS
-            return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-    
-    # Handle format like "1h 30m 45s"
-    total_seconds = 0
-    
-    # Extract hours
-    hours_match = re.search(r'(\d+)h', duration_str)
-    if hours_match:
-        total_seconds += int(hours_match.group(1)) * 3600
+        if len(parts) in (2, 3):  # MM:SS or HH:MM:SS
+            return functools.reduce(lambda total, part: total * 60 + int(part), parts, 0)
     
-    # Extract minutes
-    minutes_match = re.search(r'(\d+)m', duration_str)
-    if minutes_match:
-        total_seconds += int(minutes_match.group(1)) * 60
-    
-    # Extract seconds
-    seconds_match = re.search(r'(\d+)s', duration_str)
-    if seconds_match:
-        total_seconds += int(seconds_match.group(1))
-    
-    return total_seconds
+    # Handle format like "1h 30m 45s" in a single scan
+    return sum(int(amount) * _DURATION_UNIT_SECONDS[unit] for amount, unit in _DURATION_PART_RE.findall(duration_str))
 
 def get_engagement_category(engagement_rate: float) -> str:
     """Categorize engagement rate"""
-    if engagement_rate >= 10:
-        return "Excellent"
-    elif engagement_rate >= 5:
-        return "Good"
-    elif engagement_rate >= 2:
-        return "Average"
-    elif engagement_rate >= 1:
-        return "Below Average"
-    else:
-        return "Poor"
+    return _ENGAGEMENT_LABELS[bisect_right(_ENGAGEMENT_BOUNDS, engagement_rate)]
 
 def get_optimization_category(score: float) -> str:
     """Categorize optimization score"""
-    if score >= 80:
-        return "Excellent"
-    elif score >= 60:
-        return "Good"
-    elif score >= 40:
-        return "Needs Improvement"
-    else:
-        return "Poor"
+    return _OPTIMIZATION_LABELS[bisect_right(_OPTIMIZATION_BOUNDS, score)]
 
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename for safe file creation"""
-    # Remove invalid characters
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    # Replace invalid characters, and each run of whitespace, with underscores
+    filename = '_'.join(filename.translate(_FILENAME_INVALID_TABLE).split())
     
-    # Remove extra whitespace and dots
-    filename = re.sub(r'\s+', '_', filename.strip())
-    filename = re.sub(r'\.+', '.', filename)
+    # Collapse runs of dots
+    filename = _DOTS_RE.sub('.', filename)
     
     # Limit length
     if len(filename) > 200:
@@ -256,18 +266,27 @@ def sanitize_filename(filename: str) -> str:
     
     return filename
 
+@functools.lru_cache(maxsize=2048)
 def is_valid_email(email: str) -> bool:
     """Validate email address"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    # Structural checks equivalent to local@domain.tld with the usual character sets
+    if not email or email.count('@') != 1:
+        return False
+    
+    local, domain = email.split('@')
+    name, _, tld = domain.rpartition('.')
+    return (
+        bool(local) and bool(name)
+        and len(tld) >= 2 and tld.isascii() and tld.isalpha()
+        and _EMAIL_LOCAL_CHARS.issuperset(local)
+        and _EMAIL_DOMAIN_CHARS.issuperset(name)
+    )
 
 def generate_report_filename(channel_name: str) -> str:
     """Generate a safe filename for reports"""
-    from datetime import datetime
-    
     # Clean channel name
-    clean_name = re.sub(r'[^\w\s-]', '', channel_name)
-    clean_name = re.sub(r'[-\s]+', '_', clean_name)
+    clean_name = _REPORT_NAME_INVALID_RE.sub('', channel_name)
+    clean_name = _REPORT_NAME_SEPARATORS_RE.sub('_', clean_name)
     
     # Add timestamp
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -1,8 +1,14 @@
+import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 import json
-from typing import Dict, List, Optional, Union
+import orjson
+from typing import Dict, List, Optional, Tuple, Union
 from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
 from urllib.parse import urlparse, parse_qs
 import yt_dlp
 from selenium import webdriver
@@ -12,22 +18,222 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
-import time
+from selenium.common.exceptions import TimeoutException
 import logging
+import multiprocessing
+import multiprocessing.util
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+# Set up logging; LOGLEVEL=WARNING silences routine progress messages
+logging.basicConfig(level=os.environ.get('LOGLEVEL', 'INFO').upper())
 logger = logging.getLogger(__name__)
 
+# Page patterns, compiled once; the count extractors try them in order
+_VIEW_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(\d+(?:,\d+)*)\s*views?',
+    r'viewCount.*?(\d+)',
+    r'"viewCount":"(\d+)"',
+))
+_LIKE_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'"likeCount":"(\d+)"',
+    r'likeCount.*?(\d+)',
+    r'(\d+(?:,\d+)*)\s*likes?',
+))
+_SUBSCRIBER_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(\d+(?:\.\d+)?[KMB]?)\s*subscribers?',
+    r'"subscriberCountText".*?"(\d+(?:\.\d+)?[KMB]?)"',
+))
+
+def _search_patterns(patterns: Tuple[re.Pattern, ...], content: str) -> Optional[str]:
+    """Capture of the first pattern, in order, that matches anywhere in content"""
+    for pattern in patterns:
+        match = pattern.search(content)
+        if match:
+            return match.group(1)
+    return None
+
+_NON_DIGIT_RE = re.compile(r'\D')
+# Count suffixes in either case, looked up by a count string's last character
+_COUNT_MULTIPLIERS = {'K': 1000, 'M': 1000000, 'B': 1000000000}
+_COUNT_MULTIPLIERS.update({suffix.lower(): value for suffix, value in _COUNT_MULTIPLIERS.items()})
+
+# YouTube pages embed their render data as JSON in a script tag; the
+# count extractors read it first and fall back to the patterns above
+_INITIAL_DATA_MARKERS = ('var ytInitialData = ', 'window["ytInitialData"] = ')
+_INITIAL_DATA_END = ';</script>'
+_VIDEO_ID_RE = re.compile(r'(?:watch\?v=|youtu\.be/|embed/)([a-zA-Z0-9_-]{11})')
+
+# Channel videos whose details are fetched at once; yt-dlp calls are
+# independent network round trips, so they overlap well on threads
+DETAIL_FETCH_WORKERS = 8
+
+# Connect and read timeouts for plain HTTP fetches
+REQUEST_TIMEOUT = (5, 30)
+
+# Longest wait for a Selenium-loaded page to expose its metadata
+SELENIUM_WAIT_TIMEOUT = 10
+_OG_TITLE_SELECTOR = 'meta[property="og:title"]'
+
+# Browser processes started for parallel Selenium fallbacks, each owning one
+# headless Chrome, and the longest a caller waits for one of them to load a page;
+# the first loads also get the startup allowance while the browsers launch
+SELENIUM_POOL_SIZE = 4
+SELENIUM_FETCH_TIMEOUT = 60
+SELENIUM_STARTUP_TIMEOUT = 60
+# Relative watch links on a channel page
+_VIDEO_LINK_SELECTOR = 'a[href^="/watch?v="]'
+
+# Per-URL video analyses kept in memory, so repeat lookups skip yt-dlp;
+# counts go stale, hence the expiry
+VIDEO_CACHE_SIZE = 512
+VIDEO_CACHE_TTL = 600
+
+# Heading tags gathered in one tree walk by _extract_headings
+_HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+# Count-only checks run as compiled XPath on a bare lxml tree, skipping the
+# BeautifulSoup wrapper
+_STRUCTURE_XPATHS = {
+    'paragraphs': etree.XPath('count(//p)'),
+    'lists': etree.XPath('count(//ul | //ol)'),
+    'tables': etree.XPath('count(//table)'),
+    'forms': etree.XPath('count(//form)'),
+    'scripts': etree.XPath('count(//script)'),
+    'stylesheets': etree.XPath("count(//link[contains(concat(' ', normalize-space(@rel), ' '), ' stylesheet ')])"),
+}
+_H1_COUNT_XPATH = etree.XPath('count(//h1)')
+_IMAGE_COUNT_XPATH = etree.XPath("count(//img[@src != ''])")
+_LINK_COUNT_XPATH = etree.XPath("count(//a[@href != ''])")
+_TITLE_XPATH = etree.XPath('(//title)[1]')
+
+# Attributes a <meta> tag is indexed under by _index_meta
+_META_KEY_ATTRS = ('property', 'name', 'itemprop')
+
+@lru_cache(maxsize=1024)
+def _video_id_from_url(url: str) -> str:
+    """Extract video ID from YouTube URL"""
+    match = _VIDEO_ID_RE.search(url)
+    return match.group(1) if match else ""
+
+def _create_chrome_driver(driver_path: Optional[str] = None) -> webdriver.Chrome:
+    """Start a headless Chrome, installing chromedriver first unless its path is given"""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    
+    service = Service(driver_path or ChromeDriverManager().install())
+    return webdriver.Chrome(service=service, options=chrome_options)
+
+def _load_page_source(driver: webdriver.Chrome, url: str) -> str:
+    """Load a page and return its source once the metadata is present"""
+    driver.get(url)
+    # Wait until the metadata is present rather than a fixed delay
+    try:
+        WebDriverWait(driver, SELENIUM_WAIT_TIMEOUT).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, _OG_TITLE_SELECTOR))
+        )
+    except TimeoutException:
+        logger.warning("Timed out waiting for page metadata: %s", url)
+    return driver.page_source
+
+# The Chrome owned by this process when it is a SeleniumPool worker
+_pool_driver = None
+
+def _init_pool_driver(driver_path: str):
+    """SeleniumPool worker initializer: start this process's browser and quit it on exit"""
+    global _pool_driver
+    try:
+        _pool_driver = _create_chrome_driver(driver_path)
+    except Exception as e:
+        # Raising here would make the pool respawn the worker forever
+        logger.error("Failed to setup selenium: %s", e)
+        return
+    # Pool workers leave through os._exit, which skips atexit; finalizers still run
+    multiprocessing.util.Finalize(None, _pool_driver.quit, exitpriority=10)
+
+def _fetch_page_source(url: str) -> Optional[str]:
+    """SeleniumPool task: load a page in this worker's browser"""
+    if _pool_driver is None:
+        return None
+    return _load_page_source(_pool_driver, url)
+
+class SeleniumPool:
+    """Headless Chrome instances in separate processes, for page loads that run in parallel"""
+    
+    def __init__(self, processes: int = SELENIUM_POOL_SIZE):
+        self.processes = processes
+        self._pool = None
+        self._startup_deadline = 0.0
+        self._lock = threading.Lock()
+    
+    def __enter__(self) -> 'SeleniumPool':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def fetch(self, url: str) -> Optional[str]:
+        """Load a page in one of the pooled browsers, starting them on first use"""
+        try:
+            with self._lock:
+                if self._pool is None:
+                    # chromedriver is installed once here rather than by every worker
+                    driver_path = ChromeDriverManager().install()
+                    # Spawned rather than forked: the parent holds threads and locks a fork would copy mid-use
+                    context = multiprocessing.get_context('spawn')
+                    self._pool = context.Pool(
+                        processes=self.processes, initializer=_init_pool_driver, initargs=(driver_path,)
+                    )
+                    self._startup_deadline = time.monotonic() + SELENIUM_STARTUP_TIMEOUT
+                pool = self._pool
+            
+            # Browser startup does not count against the page load
+            timeout = SELENIUM_FETCH_TIMEOUT + max(0.0, self._startup_deadline - time.monotonic())
+            return pool.apply_async(_fetch_page_source, (url,)).get(timeout=timeout)
+        except Exception as e:
+            logger.error("Selenium pool error: %s", e)
+            return None
+    
+    def close(self):
+        """Stop the worker processes, each quitting its browser"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+            pool.join()
+
 class WebScraper:
     """Universal web scraper for YouTube and other websites"""
     
+    # C-backed lxml parses large YouTube pages several times faster than html.parser
+    PARSER = 'lxml'
+    
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
+        # Keep-alive pool sized for concurrent fetches, with retries on throttling and server errors
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.driver = None
+        # One Chrome instance is shared, so only one thread may drive it at a time
+        self._selenium_lock = threading.Lock()
+        # url -> (monotonic time stored, analysis), least recently used first
+        self._video_cache: OrderedDict = OrderedDict()
+        self._video_cache_lock = threading.Lock()
     
     def is_configured(self) -> bool:
         """Always returns True since no API key is needed"""
@@ -41,46 +247,59 @@ class WebScraper:
             else:
                 return self._get_content_requests(url)
         except Exception as e:
-            logger.error(f"Error fetching content from {url}: {e}")
+            logger.error("Error fetching content from %s: %s", url, e)
             return None
     
     def _get_content_requests(self, url: str) -> Optional[str]:
         """Get content using requests library"""
         try:
-            response = self.session.get(url, timeout=30)
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             return response.text
         except Exception as e:
-            logger.error(f"Requests error: {e}")
+            logger.error("Requests error: %s", e)
             return None
     
+    def get_page_bytes(self, url: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """Get the undecoded page body and the charset from its Content-Type header, if any"""
+        try:
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+            response.raise_for_status()
+            # Without a declared charset the parsers read <meta charset> themselves
+            declared = 'charset' in response.headers.get('Content-Type', '').lower()
+            return response.content, response.encoding if declared else None
+        except Exception as e:
+            logger.error("Requests error: %s", e)
+            return None, None
+    
     def _get_content_selenium(self, url: str) -> Optional[str]:
         """Get content using selenium for dynamic content"""
         try:
-            if not self.driver:
-                self._setup_selenium()
-            
-            self.driver.get(url)
-            time.sleep(3)  # Wait for dynamic content to load
-            return self.driver.page_source
+            with self._selenium_lock:
+                if not self.driver:
+                    self._setup_selenium()
+                
+                return _load_page_source(self.driver, url)
         except Exception as e:
-            logger.error(f"Selenium error: {e}")
+            logger.error("Selenium error: %s", e)
             return None
     
+    def _get_youtube_page(self, url: str, selenium_pool: Optional[SeleniumPool] = None) -> Optional[str]:
+        """Fetch a YouTube page over plain HTTP, using Selenium only if the metadata is missing"""
+        # YouTube serves its og: tags in the initial HTML, so a browser is rarely needed
+        content = self.get_page_content(url)
+        if content and 'property="og:title"' in content:
+            return content
+        if selenium_pool is not None:
+            return selenium_pool.fetch(url)
+        return self.get_page_content(url, use_selenium=True)
+    
     def _setup_selenium(self):
         """Setup selenium webdriver"""
         try:
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            self.driver = _create_chrome_driver()
         except Exception as e:
-            logger.error(f"Failed to setup selenium: {e}")
+            logger.error("Failed to setup selenium: %s", e)
             self.driver = None
     
     def analyze_url(self, url: str) -> Dict:
@@ -101,11 +320,30 @@ class WebScraper:
             else:
                 return self._analyze_youtube_channel(url)
         except Exception as e:
-            logger.error(f"Error analyzing YouTube URL: {e}")
+            logger.error("Error analyzing YouTube URL: %s", e)
             return {"error": str(e)}
     
-    def _analyze_youtube_video(self, url: str) -> Dict:
-        """Analyze a single YouTube video"""
+    def _analyze_youtube_video(self, url: str, selenium_pool: Optional[SeleniumPool] = None) -> Dict:
+        """Analyze a single YouTube video, reusing a recent result for the same URL"""
+        now = time.monotonic()
+        with self._video_cache_lock:
+            cached = self._video_cache.get(url)
+            if cached and now - cached[0] < VIDEO_CACHE_TTL:
+                self._video_cache.move_to_end(url)
+                return dict(cached[1])
+        
+        result = self._fetch_youtube_video(url, selenium_pool)
+        # Errors are not cached so a later call can retry
+        if 'error' not in result:
+            with self._video_cache_lock:
+                self._video_cache[url] = (now, result)
+                self._video_cache.move_to_end(url)
+                if len(self._video_cache) > VIDEO_CACHE_SIZE:
+                    self._video_cache.popitem(last=False)
+        return dict(result)
+    
+    def _fetch_youtube_video(self, url: str, selenium_pool: Optional[SeleniumPool] = None) -> Dict:
+        """Extract a single YouTube video with yt-dlp, scraping the page if that fails"""
         try:
             # Use yt-dlp to extract video information
             ydl_opts = {
@@ -138,9 +376,9 @@ class WebScraper:
                 return video_data
                 
         except Exception as e:
-            logger.error(f"Error extracting video info: {e}")
+            logger.error("Error extracting video info: %s", e)
             # Fallback to web scraping
-            return self._scrape_youtube_video(url)
+            return self._scrape_youtube_video(url, selenium_pool)
     
     def _analyze_youtube_channel(self, url: str) -> Dict:
         """Analyze YouTube channel"""
@@ -149,23 +387,26 @@ class WebScraper:
             channel_info = self._scrape_youtube_channel(url)
             return channel_info
         except Exception as e:
-            logger.error(f"Error analyzing YouTube channel: {e}")
+            logger.error("Error analyzing YouTube channel: %s", e)
             return {"error": str(e)}
     
-    def _scrape_youtube_video(self, url: str) -> Dict:
+    def _scrape_youtube_video(self, url: str, selenium_pool: Optional[SeleniumPool] = None) -> Dict:
         """Scrape YouTube video page"""
         try:
-            content = self.get_page_content(url, use_selenium=True)
+            content = self._get_youtube_page(url, selenium_pool)
             if not content:
                 return {"error": "Could not fetch video content"}
             
-            soup = BeautifulSoup(content, 'html.parser')
+            soup = BeautifulSoup(content, self.PARSER)
+            meta = self._index_meta(soup)
             
             # Extract basic information
-            title = self._extract_youtube_title(soup)
-            description = self._extract_youtube_description(soup)
-            views = self._extract_youtube_views(soup)
-            likes = self._extract_youtube_likes(soup)
+            title = self._extract_youtube_title(soup, meta)
+            description = self._extract_youtube_description(soup, meta)
+            # The count patterns run on the raw HTML; re-serializing the soup would copy the whole page
+            initial_data = self._get_initial_data(content)
+            views = self._extract_youtube_views(soup, content, initial_data)
+            likes = self._extract_youtube_likes(soup, content)
             
             return {
                 'type': 'video',
@@ -174,27 +415,28 @@ class WebScraper:
                 'view_count': views,
                 'like_count': likes,
                 'comment_count': 0,  # Difficult to scrape accurately
-                'tags': self._extract_youtube_tags(soup),
+                'tags': self._extract_youtube_tags(meta),
                 'webpage_url': url,
                 'scraping_method': 'beautifulsoup'
             }
             
         except Exception as e:
-            logger.error(f"Error scraping YouTube video: {e}")
+            logger.error("Error scraping YouTube video: %s", e)
             return {"error": str(e)}
     
     def _scrape_youtube_channel(self, url: str) -> Dict:
         """Scrape YouTube channel page"""
         try:
-            content = self.get_page_content(url, use_selenium=True)
+            content = self._get_youtube_page(url)
             if not content:
                 return {"error": "Could not fetch channel content"}
             
-            soup = BeautifulSoup(content, 'html.parser')
+            soup = BeautifulSoup(content, self.PARSER)
+            meta = self._index_meta(soup)
             
             # Extract channel info
-            channel_name = self._extract_channel_name(soup)
-            subscriber_count = self._extract_subscriber_count(soup)
+            channel_name = self._extract_channel_name(soup, meta)
+            subscriber_count = self._extract_subscriber_count(soup, content, self._get_initial_data(content))
             
             # Extract recent videos
             videos = self._extract_channel_videos(soup, url)
@@ -210,25 +452,26 @@ class WebScraper:
             }
             
         except Exception as e:
-            logger.error(f"Error scraping YouTube channel: {e}")
+            logger.error("Error scraping YouTube channel: %s", e)
             return {"error": str(e)}
     
     def _analyze_generic_website(self, url: str) -> Dict:
         """Analyze any website"""
         try:
-            content = self.get_page_content(url)
+            # Both parsers take the raw bytes, so the body is never decoded into a str
+            content, encoding = self.get_page_bytes(url)
             if not content:
                 return {"error": "Could not fetch website content"}
             
-            soup = BeautifulSoup(content, 'html.parser')
+            soup = BeautifulSoup(content, self.PARSER, from_encoding=encoding)
+            tree = lxml.html.fromstring(content, parser=lxml.html.HTMLParser(encoding=encoding))
+            meta = self._index_meta(soup)
             
             # Extract basic website information
-            title = self._extract_website_title(soup)
-            description = self._extract_website_description(soup)
-            keywords = self._extract_website_keywords(soup)
+            title = self._extract_website_title(soup, meta)
+            description = self._extract_website_description(meta)
+            keywords = self._extract_website_keywords(meta)
             headings = self._extract_headings(soup)
-            images = self._extract_images(soup)
-            links = self._extract_links(soup)
             
             return {
                 'type': 'website',
@@ -236,23 +479,36 @@ class WebScraper:
                 'description': description,
                 'keywords': keywords,
                 'headings': headings,
-                'images': len(images),
-                'links': len(links),
+                'images': self._count_images(tree),
+                'links': self._count_links(tree),
                 'webpage_url': url,
-                'content_analysis': self._analyze_content_structure(soup),
-                'seo_analysis': self._analyze_website_seo(soup),
+                'content_analysis': self._analyze_content_structure(tree),
+                'seo_analysis': self._analyze_website_seo(tree, meta),
                 'scraping_method': 'beautifulsoup'
             }
             
         except Exception as e:
-            logger.error(f"Error analyzing website: {e}")
+            logger.error("Error analyzing website: %s", e)
             return {"error": str(e)}
     
-    def _extract_youtube_title(self, soup: BeautifulSoup) -> str:
+    def _index_meta(self, soup: BeautifulSoup) -> Dict[Tuple[str, str], str]:
+        """Map (attribute, lowercased value) of every <meta> tag to its content, first tag winning"""
+        meta = {}
+        for el in soup.find_all('meta'):
+            for attr in _META_KEY_ATTRS:
+                value = el.get(attr)
+                if value:
+                    meta.setdefault((attr, value.lower()), el.get('content', ''))
+        
+        return meta
+    
+    def _extract_youtube_title(self, soup: BeautifulSoup, meta: Dict[Tuple[str, str], str]) -> str:
         """Extract YouTube video title"""
+        title = meta.get(('property', 'og:title')) or meta.get(('name', 'title'))
+        if title:
+            return title
+        
         selectors = [
-            'meta[property="og:title"]',
-            'meta[name="title"]',
             'title',
             'h1.title',
             '.watch-main-col h1'
@@ -261,15 +517,17 @@ class WebScraper:
         for selector in selectors:
             element = soup.select_one(selector)
             if element:
-                return element.get('content', '') or element.get_text(strip=True)
+                return element.get_text(strip=True)
         
         return "Unknown Title"
     
-    def _extract_youtube_description(self, soup: BeautifulSoup) -> str:
+    def _extract_youtube_description(self, soup: BeautifulSoup, meta: Dict[Tuple[str, str], str]) -> str:
         """Extract YouTube video description"""
+        description = meta.get(('property', 'og:description')) or meta.get(('name', 'description'))
+        if description:
+            return description
+        
         selectors = [
-            'meta[property="og:description"]',
-            'meta[name="description"]',
             '.watch-main-col .content',
             '#watch-description-text'
         ]
@@ -277,65 +535,68 @@ class WebScraper:
         for selector in selectors:
             element = soup.select_one(selector)
             if element:
-                return element.get('content', '') or element.get_text(strip=True)
+                return element.get_text(strip=True)
         
         return ""
     
-    def _extract_youtube_views(self, soup: BeautifulSoup) -> int:
-        """Extract view count from YouTube video"""
-        # Look for view count in various places
-        view_patterns = [
-            r'(\d+(?:,\d+)*)\s*views?',
-            r'viewCount.*?(\d+)',
-            r'"viewCount":"(\d+)"'
-        ]
-        
-        content = str(soup)
-        for pattern in view_patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                try:
-                    return int(match.group(1).replace(',', ''))
-                except:
-                    continue
+    def _get_initial_data(self, content: str) -> Dict:
+        """Parse the ytInitialData JSON embedded in a YouTube page, or {} if it is missing"""
+        for marker in _INITIAL_DATA_MARKERS:
+            start = content.find(marker)
+            if start != -1:
+                break
+        else:
+            return {}
         
-        return 0
-    
-    def _extract_youtube_likes(self, soup: BeautifulSoup) -> int:
-        """Extract like count from YouTube video"""
-        like_patterns = [
-            r'"likeCount":"(\d+)"',
-            r'likeCount.*?(\d+)',
-            r'(\d+(?:,\d+)*)\s*likes?'
-        ]
+        start += len(marker)
+        end = content.find(_INITIAL_DATA_END, start)
+        if end == -1:
+            return {}
         
-        content = str(soup)
-        for pattern in like_patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                try:
-                    return int(match.group(1).replace(',', ''))
-                except:
-                    continue
+        try:
+            return orjson.loads(content[start:end])
+        except orjson.JSONDecodeError:
+            return {}
+    
+    def _extract_youtube_views(self, soup: BeautifulSoup, content: Optional[str] = None,
+                               initial_data: Optional[Dict] = None) -> int:
+        """Extract view count from YouTube video, searching the raw HTML when it is given"""
+        if initial_data:
+            sections = (initial_data.get('contents', {}).get('twoColumnWatchNextResults', {})
+                        .get('results', {}).get('results', {}).get('contents', []))
+            for section in sections:
+                view_text = (section.get('videoPrimaryInfoRenderer', {}).get('viewCount', {})
+                             .get('videoViewCountRenderer', {}).get('viewCount', {}).get('simpleText', ''))
+                digits = _NON_DIGIT_RE.sub('', view_text)
+                if digits:
+                    return int(digits)
         
-        return 0
-    
-    def _extract_youtube_tags(self, soup: BeautifulSoup) -> List[str]:
+        # Look for view count in various places
+        if content is None:
+            content = str(soup)
+        count = _search_patterns(_VIEW_PATTERNS, content)
+        return int(count.replace(',', '')) if count else 0
+    
+    def _extract_youtube_likes(self, soup: BeautifulSoup, content: Optional[str] = None) -> int:
+        """Extract like count from YouTube video, searching the raw HTML when it is given"""
+        if content is None:
+            content = str(soup)
+        count = _search_patterns(_LIKE_PATTERNS, content)
+        return int(count.replace(',', '')) if count else 0
+    
+    def _extract_youtube_tags(self, meta: Dict[Tuple[str, str], str]) -> List[str]:
         """Extract tags from YouTube video"""
-        tags = []
-        
         # Look for keywords meta tag
-        keywords_meta = soup.find('meta', {'name': 'keywords'})
-        if keywords_meta:
-            content = keywords_meta.get('content', '')
-            tags = [tag.strip() for tag in content.split(',') if tag.strip()]
-        
-        return tags
+        content = meta.get(('name', 'keywords'), '')
+        return [tag.strip() for tag in content.split(',') if tag.strip()]
     
-    def _extract_channel_name(self, soup: BeautifulSoup) -> str:
+    def _extract_channel_name(self, soup: BeautifulSoup, meta: Dict[Tuple[str, str], str]) -> str:
         """Extract YouTube channel name"""
+        name = meta.get(('property', 'og:title'))
+        if name and 'YouTube' not in name:
+            return name
+        
         selectors = [
-            'meta[property="og:title"]',
             '.channel-header-profile-image-container + .branded-page-header-title-link',
             '.ytd-channel-name a',
             'title'
@@ -350,194 +611,161 @@ class WebScraper:
         
         return "Unknown Channel"
     
-    def _extract_subscriber_count(self, soup: BeautifulSoup) -> int:
-        """Extract subscriber count from YouTube channel"""
-        patterns = [
-            r'(\d+(?:\.\d+)?[KMB]?)\s*subscribers?',
-            r'"subscriberCountText".*?"(\d+(?:\.\d+)?[KMB]?)"',
-        ]
-        
-        content = str(soup)
-        for pattern in patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                count_str = match.group(1)
-                return self._parse_count(count_str)
-        
-        return 0
+    def _extract_subscriber_count(self, soup: BeautifulSoup, content: Optional[str] = None,
+                                  initial_data: Optional[Dict] = None) -> int:
+        """Extract subscriber count from YouTube channel, searching the raw HTML when it is given"""
+        if initial_data:
+            subscriber_text = (initial_data.get('header', {}).get('c4TabbedHeaderRenderer', {})
+                               .get('subscriberCountText', {}).get('simpleText', ''))
+            if subscriber_text:
+                # e.g. "1.2M subscribers"
+                return self._parse_count(subscriber_text.split()[0])
+        
+        if content is None:
+            content = str(soup)
+        count_str = _search_patterns(_SUBSCRIBER_PATTERNS, content)
+        return self._parse_count(count_str) if count_str else 0
     
     def _extract_channel_videos(self, soup: BeautifulSoup, channel_url: str) -> List[Dict]:
         """Extract recent videos from channel page"""
         videos = []
         
-        # Look for video links
-        video_links = soup.find_all('a', {'href': re.compile(r'/watch\?v=')})
-        
-        for link in video_links[:20]:  # Limit to first 20 videos
-            href = link.get('href', '')
-            if href.startswith('/watch'):
+        # Look for video links; the selector stops after the first 20
+        for link in soup.select(_VIDEO_LINK_SELECTOR, limit=20):
+            href = link['href']
+            title = link.get('title', '') or link.get_text(strip=True)
+            
+            if title and len(title) > 5:  # Filter out empty or very short titles
                 video_url = 'https://www.youtube.com' + href
-                title = link.get('title', '') or link.get_text(strip=True)
-                
-                if title and len(title) > 5:  # Filter out empty or very short titles
-                    videos.append({
-                        'title': title,
-                        'url': video_url,
-                        'id': self._extract_video_id_from_url(video_url)
-                    })
+                videos.append({
+                    'title': title,
+                    'url': video_url,
+                    'id': self._extract_video_id_from_url(video_url)
+                })
         
         return videos
     
-    def _extract_website_title(self, soup: BeautifulSoup) -> str:
+    def _extract_website_title(self, soup: BeautifulSoup, meta: Dict[Tuple[str, str], str]) -> str:
         """Extract website title"""
-        selectors = [
-            'meta[property="og:title"]',
-            'meta[name="title"]',
-            'title',
-            'h1'
-        ]
+        title = meta.get(('property', 'og:title')) or meta.get(('name', 'title'))
+        if title:
+            return title
         
-        for selector in selectors:
+        for selector in ('title', 'h1'):
             element = soup.select_one(selector)
             if element:
-                return element.get('content', '') or element.get_text(strip=True)
+                return element.get_text(strip=True)
         
         return "Unknown Title"
     
-    def _extract_website_description(self, soup: BeautifulSoup) -> str:
+    def _extract_website_description(self, meta: Dict[Tuple[str, str], str]) -> str:
         """Extract website description"""
-        selectors = [
-            'meta[property="og:description"]',
-            'meta[name="description"]',
-            'meta[name="Description"]'
-        ]
-        
-        for selector in selectors:
-            element = soup.select_one(selector)
-            if element:
-                return element.get('content', '')
-        
-        return ""
+        # Keys are lowercased, so this also covers name="Description"
+        return meta.get(('property', 'og:description')) or meta.get(('name', 'description'), '')
     
-    def _extract_website_keywords(self, soup: BeautifulSoup) -> List[str]:
+    def _extract_website_keywords(self, meta: Dict[Tuple[str, str], str]) -> List[str]:
         """Extract website keywords"""
-        keywords_meta = soup.find('meta', {'name': 'keywords'})
-        if keywords_meta:
-            content = keywords_meta.get('content', '')
-            return [kw.strip() for kw in content.split(',') if kw.strip()]
-        
-        return []
+        content = meta.get(('name', 'keywords'), '')
+        return [kw.strip() for kw in content.split(',') if kw.strip()]
     
     def _extract_headings(self, soup: BeautifulSoup) -> Dict[str, List[str]]:
         """Extract all headings"""
-        headings = {}
-        for i in range(1, 7):
-            tag = f'h{i}'
-            elements = soup.find_all(tag)
-            headings[tag] = [el.get_text(strip=True) for el in elements if el.get_text(strip=True)]
+        headings = {tag: [] for tag in _HEADING_TAGS}
+        for el in soup.find_all(_HEADING_TAGS):
+            text = el.get_text(strip=True)
+            if text:
+                headings[el.name].append(text)
         
         return headings
     
-    def _extract_images(self, soup: BeautifulSoup) -> List[str]:
-        """Extract image URLs"""
-        images = soup.find_all('img')
-        return [img.get('src', '') for img in images if img.get('src')]
+    def _count_images(self, tree: etree._Element) -> int:
+        """Count images with a source"""
+        return int(_IMAGE_COUNT_XPATH(tree))
     
-    def _extract_links(self, soup: BeautifulSoup) -> List[str]:
-        """Extract all links"""
-        links = soup.find_all('a')
-        return [link.get('href', '') for link in links if link.get('href')]
+    def _count_links(self, tree: etree._Element) -> int:
+        """Count links with a target"""
+        return int(_LINK_COUNT_XPATH(tree))
     
-    def _analyze_content_structure(self, soup: BeautifulSoup) -> Dict:
+    def _analyze_content_structure(self, tree: etree._Element) -> Dict:
         """Analyze website content structure"""
-        return {
-            'paragraphs': len(soup.find_all('p')),
-            'lists': len(soup.find_all(['ul', 'ol'])),
-            'tables': len(soup.find_all('table')),
-            'forms': len(soup.find_all('form')),
-            'scripts': len(soup.find_all('script')),
-            'stylesheets': len(soup.find_all('link', {'rel': 'stylesheet'}))
-        }
+        return {key: int(xpath(tree)) for key, xpath in _STRUCTURE_XPATHS.items()}
     
-    def _analyze_website_seo(self, soup: BeautifulSoup) -> Dict:
+    def _analyze_website_seo(self, tree: etree._Element, meta: Dict[Tuple[str, str], str]) -> Dict:
         """Basic SEO analysis of website"""
-        title = soup.find('title')
-        description = soup.find('meta', {'name': 'description'})
-        h1_tags = soup.find_all('h1')
+        title = _TITLE_XPATH(tree)
+        description = meta.get(('name', 'description'))
         
         return {
             'has_title': bool(title),
-            'title_length': len(title.get_text()) if title else 0,
-            'has_meta_description': bool(description),
-            'meta_description_length': len(description.get('content', '')) if description else 0,
-            'h1_count': len(h1_tags),
-            'has_og_tags': bool(soup.find('meta', {'property': re.compile(r'^og:')})),
-            'has_twitter_cards': bool(soup.find('meta', {'name': re.compile(r'^twitter:')}))
+            'title_length': len(title[0].text_content()) if title else 0,
+            'has_meta_description': description is not None,
+            'meta_description_length': len(description or ''),
+            'h1_count': int(_H1_COUNT_XPATH(tree)),
+            'has_og_tags': any(attr == 'property' and value.startswith('og:') for attr, value in meta),
+            'has_twitter_cards': any(attr == 'name' and value.startswith('twitter:') for attr, value in meta)
         }
     
     def _parse_count(self, count_str: str) -> int:
         """Parse count string like '1.2M' to integer"""
-        count_str = count_str.upper().strip()
-        
-        multipliers = {'K': 1000, 'M': 1000000, 'B': 1000000000}
-        
-        for suffix, multiplier in multipliers.items():
-            if count_str.endswith(suffix):
-                number = float(count_str[:-1])
-                return int(number * multiplier)
+        count_str = count_str.strip().replace(',', '')
+        multiplier = _COUNT_MULTIPLIERS.get(count_str[-1:])
+        if multiplier:
+            count_str = count_str[:-1]
+        else:
+            multiplier = 1
         
-        try:
-            return int(float(count_str))
-        except:
+        # Validate up front rather than letting float() raise on unexpected text
+        if not count_str.replace('.', '', 1).isdecimal():
             return 0
+        return int(float(count_str) * multiplier)
     
     def _extract_video_id_from_url(self, url: str) -> str:
         """Extract video ID from YouTube URL"""
-        patterns = [
-            r'watch\?v=([a-zA-Z0-9_-]{11})',
-            r'youtu\.be/([a-zA-Z0-9_-]{11})',
-            r'embed/([a-zA-Z0-9_-]{11})'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        
-        return ""
+        return _video_id_from_url(url)
     
     def get_channel_videos_detailed(self, videos: List[Dict], max_videos: int = 20) -> List[Dict]:
         """Get detailed information for channel videos"""
-        detailed_videos = []
-        
-        for i, video in enumerate(videos[:max_videos]):
-            if 'url' in video:
-                try:
-                    detailed_info = self._analyze_youtube_video(video['url'])
-                    if 'error' not in detailed_info:
-                        detailed_videos.append(detailed_info)
-                    else:
-                        # Add basic info if detailed extraction fails
-                        detailed_videos.append({
-                            'title': video.get('title', ''),
-                            'id': video.get('id', ''),
-                            'webpage_url': video.get('url', ''),
-                            'view_count': 0,
-                            'like_count': 0,
-                            'comment_count': 0,
-                            'description': '',
-                            'tags': []
-                        })
-                except Exception as e:
-                    logger.error(f"Error getting detailed info for video {i+1}: {e}")
-                    continue
-        
-        return detailed_videos
+        videos = [video for video in videos[:max_videos] if 'url' in video]
+        if not videos:
+            return []
+        
+        # Videos yt-dlp cannot extract fall back to Selenium; a pool for this call lets those
+        # page loads overlap, and its browsers only start if a fallback actually needs one
+        with SeleniumPool() as selenium_pool:
+            # Fetch concurrently; map keeps the channel's video order
+            with ThreadPoolExecutor(max_workers=min(DETAIL_FETCH_WORKERS, len(videos))) as executor:
+                results = executor.map(
+                    self._get_video_details, videos, range(1, len(videos) + 1), [selenium_pool] * len(videos)
+                )
+                return [details for details in results if details is not None]
+    
+    def _get_video_details(self, video: Dict, position: int,
+                           selenium_pool: Optional[SeleniumPool] = None) -> Optional[Dict]:
+        """Get detailed information for one channel video, or basic info if extraction fails"""
+        try:
+            detailed_info = self._analyze_youtube_video(video['url'], selenium_pool)
+            if 'error' not in detailed_info:
+                return detailed_info
+            
+            # Add basic info if detailed extraction fails
+            return {
+                'title': video.get('title', ''),
+                'id': video.get('id', ''),
+                'webpage_url': video.get('url', ''),
+                'view_count': 0,
+                'like_count': 0,
+                'comment_count': 0,
+                'description': '',
+                'tags': []
+            }
+        except Exception as e:
+            logger.error("Error getting detailed info for video %s: %s", position, e)
+            return None
     
     def __del__(self):
         """Cleanup selenium driver"""
         if self.driver:
             try:
                 self.driver.quit()
-            except:
+            except Exception:
                 pass
@@ -1,13 +1,25 @@
 import os
 import re
+import logging
 from typing import Dict, List, Optional
+import httplib2
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
-import isodate
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Socket timeout for API calls; the client keeps one connection alive across them
+API_TIMEOUT = 30
+
+# videos.list and playlistItems.list both cap a single request at 50 items
+VIDEOS_PER_REQUEST = 50
+
+# contentDetails.duration, e.g. PT1H2M3S (streams longer than a day add a P#D part)
+_DURATION_RE = re.compile(r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?')
+
 class YouTubeAPI:
     """YouTube Data API v3 wrapper"""
     
@@ -16,9 +28,16 @@ class YouTubeAPI:
         self.youtube = None
         if self.api_key:
             try:
-                self.youtube = build('youtube', 'v3', developerKey=self.api_key)
+                # The discovery document ships with the client library, so nothing is fetched or cached at build time
+                self.youtube = build(
+                    'youtube', 'v3',
+                    developerKey=self.api_key,
+                    http=httplib2.Http(timeout=API_TIMEOUT),
+                    static_discovery=True,
+                    cache_discovery=False
+                )
             except Exception as e:
-                print(f"Error initializing YouTube API: {e}")
+                logger.error("Error initializing YouTube API: %s", e)
     
     def is_configured(self) -> bool:
         """Check if YouTube API is properly configured"""
@@ -41,7 +60,7 @@ class YouTubeAPI:
             return None
             
         except HttpError as e:
-            print(f"YouTube API error: {e}")
+            logger.error("YouTube API error: %s", e)
             return None
     
     def get_channel_id_from_username(self, username: str) -> Optional[str]:
@@ -61,7 +80,7 @@ class YouTubeAPI:
             return None
             
         except HttpError as e:
-            print(f"YouTube API error: {e}")
+            logger.error("YouTube API error: %s", e)
             return None
     
     def search_channel_by_handle(self, handle: str) -> Optional[str]:
@@ -94,7 +113,7 @@ class YouTubeAPI:
             return None
             
         except HttpError as e:
-            print(f"YouTube API error: {e}")
+            logger.error("YouTube API error: %s", e)
             return None
     
     def get_channel_videos(self, channel_id: str, max_results: int = 20, include_shorts: bool = True) -> List[Dict]:
@@ -115,29 +134,28 @@ class YouTubeAPI:
             
             uploads_playlist_id = channel_response['items'][0]['contentDetails']['relatedPlaylists']['uploads']
             
-            # Get videos from uploads playlist
+            # Collect playlist IDs first, then fetch details in as few round trips as possible
             videos = []
             next_page_token = None
             
             while len(videos) < max_results:
-                playlist_request = self.youtube.playlistItems().list(
-                    part='snippet',
-                    playlistId=uploads_playlist_id,
-                    maxResults=min(50, max_results - len(videos)),
-                    pageToken=next_page_token
-                )
-                playlist_response = playlist_request.execute()
-                
-                video_ids = [item['snippet']['resourceId']['videoId'] for item in playlist_response['items']]
-                
-                # Get detailed video information
-                videos_request = self.youtube.videos().list(
-                    part='snippet,statistics,contentDetails',
-                    id=','.join(video_ids)
-                )
-                videos_response = videos_request.execute()
+                video_ids = []
+                while len(video_ids) < max_results - len(videos):
+                    playlist_request = self.youtube.playlistItems().list(
+                        part='snippet',
+                        playlistId=uploads_playlist_id,
+                        maxResults=min(VIDEOS_PER_REQUEST, max_results - len(videos) - len(video_ids)),
+                        pageToken=next_page_token
+                    )
+                    playlist_response = playlist_request.execute()
+                    
+                    video_ids.extend(item['snippet']['resourceId']['videoId'] for item in playlist_response['items'])
+                    
+                    next_page_token = playlist_response.get('nextPageToken')
+                    if not next_page_token:
+                        break
                 
-                for video in videos_response['items']:
+                for video in self._get_videos_details(video_ids):
                     video_data = self._process_video_data(video)
                     
                     # Filter shorts if not included
@@ -146,16 +164,49 @@ class YouTubeAPI:
                     
                     videos.append(video_data)
                 
-                next_page_token = playlist_response.get('nextPageToken')
                 if not next_page_token:
                     break
             
             return videos[:max_results]
             
         except HttpError as e:
-            print(f"YouTube API error: {e}")
+            logger.error("YouTube API error: %s", e)
             return []
     
+    def _get_videos_details(self, video_ids: List[str]) -> List[Dict]:
+        """Fetch video resources in 50-ID chunks, batched into a single HTTP request"""
+        chunks = [video_ids[i:i + VIDEOS_PER_REQUEST] for i in range(0, len(video_ids), VIDEOS_PER_REQUEST)]
+        if not chunks:
+            return []
+        
+        def videos_request(chunk: List[str]):
+            return self.youtube.videos().list(
+                part='snippet,statistics,contentDetails',
+                id=','.join(chunk)
+            )
+        
+        if len(chunks) == 1:
+            return videos_request(chunks[0]).execute()['items']
+        
+        responses = {}
+        errors = []
+        
+        def collect(request_id, response, exception):
+            if exception is not None:
+                errors.append(exception)
+            else:
+                responses[request_id] = response
+        
+        batch = self.youtube.new_batch_http_request(callback=collect)
+        for index, chunk in enumerate(chunks):
+            batch.add(videos_request(chunk), request_id=str(index))
+        batch.execute()
+        
+        if errors:
+            raise errors[0]
+        
+        return [video for index in range(len(chunks)) for video in responses[str(index)]['items']]
+    
     def _process_video_data(self, video: Dict) -> Dict:
         """Process raw video data from YouTube API"""
         snippet = video['snippet']
@@ -164,7 +215,9 @@ class YouTubeAPI:
         
         # Parse duration
         duration_iso = content_details.get('duration', 'PT0S')
-        duration_seconds = int(isodate.parse_duration(duration_iso).total_seconds())
+        match = _DURATION_RE.fullmatch(duration_iso)
+        days, hours, minutes, seconds = (int(group or 0) for group in match.groups()) if match else (0, 0, 0, 0)
+        duration_seconds = days * 86400 + hours * 3600 + minutes * 60 + seconds
         duration_formatted = self._format_duration(duration_seconds)
         
         # Get thumbnail URL
@@ -194,17 +247,16 @@ class YouTubeAPI:
     def _is_short_video(self, duration: str) -> bool:
         """Check if video is a YouTube Short (under 60 seconds)"""
         # Parse duration string like "1:30" or "0:45"
-        try:
-            parts = duration.split(':')
-            if len(parts) == 2:
-                minutes, seconds = int(parts[0]), int(parts[1])
-                total_seconds = minutes * 60 + seconds
-                return total_seconds <= 60
-            elif len(parts) == 3:
-                hours, minutes, seconds = int(parts[0]), int(parts[1]), int(parts[2])
-                return hours == 0 and minutes == 0 and seconds <= 60
-        except:
-            pass
+        parts = duration.split(':')
+        if not all(part.isdigit() for part in parts):
+            return False
+        if len(parts) == 2:
+            minutes, seconds = int(parts[0]), int(parts[1])
+            total_seconds = minutes * 60 + seconds
+            return total_seconds <= 60
+        elif len(parts) == 3:
+            hours, minutes, seconds = int(parts[0]), int(parts[1]), int(parts[2])
+            return hours == 0 and minutes == 0 and seconds <= 60
         return False
     
     def _format_duration(self, seconds: int) -> str:
@@ -245,5 +297,5 @@ class YouTubeAPI:
             return comments
             
         except HttpError as e:
-            print(f"YouTube API error: {e}")
+            logger.error("YouTube API error: %s", e)
             return []